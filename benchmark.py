@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the GitHub Stats SVG API
+
+Runs against local stubs only - no GitHub token or network needed.
+
+Usage:
+    python benchmark.py            # run every benchmark
+    python benchmark.py issues     # run a single benchmark
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+
+from aiohttp import web
+
+from src.cache_codecs import CODECS, decode_value
+from src.compression import compress_variants
+from src.github_api import GitHubAPI
+from src.repo_stats import RepoStats
+from src.svg_compact import compact_svg
+from src.svg_generator import SVGGenerator
+
+STUB_HOST = "127.0.0.1"
+STUB_PORT = 8799
+
+async def start_stub_github(latency: float) -> web.AppRunner:
+    """Start a local stub of the GitHub REST API that answers after `latency` seconds"""
+
+    async def listing(request):
+        await asyncio.sleep(latency)
+        url = f"http://{STUB_HOST}:{STUB_PORT}{request.path_qs}"
+        return web.json_response(
+            [{}],
+            headers={"Link": f'<{url}&page=2>; rel="next", <{url}&page=42>; rel="last"'}
+        )
+
+    async def search(request):
+        await asyncio.sleep(latency)
+        return web.json_response({"total_count": 42, "items": []})
+
+    app = web.Application()
+    app.router.add_get("/repos/{owner}/{repo}/issues", listing)
+    app.router.add_get("/repos/{owner}/{repo}/pulls", listing)
+    app.router.add_get("/search/issues", search)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, STUB_HOST, STUB_PORT).start()
+    return runner
+
+async def benchmark_issues(rounds: int = 20, latency: float = 0.05):
+    """Compare sequential vs concurrent issue count queries"""
+    print(f"\n📊 get_issues_stats: {rounds} rounds, {latency * 1000:.0f} ms stub latency")
+    print("=" * 50)
+
+    runner = await start_stub_github(latency)
+    github_api = GitHubAPI()
+    github_api.base_url = f"http://{STUB_HOST}:{STUB_PORT}"
+    await github_api.start()
+
+    base = f"{github_api.base_url}/repos/octo/repo"
+    urls = [
+        f"{base}/issues?state=open&per_page=1",
+        f"{base}/issues?state=closed&per_page=1"
+    ]
+
+    async def sequential():
+        # The pre-parallelization behaviour: one count request after another
+        for url in urls:
+            await github_api._count_from_link(url)
+
+    async def concurrent():
+        await github_api.get_issues_stats("octo", "repo")
+
+    try:
+        results = {}
+        for source in ("link", "search"):
+            github_api.issue_count_source = source
+            await concurrent()  # Warm up the connection pool
+            start = time.perf_counter()
+            for _ in range(rounds):
+                await concurrent()
+            results[f"concurrent ({source})"] = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await sequential()
+        results["sequential (link)"] = (time.perf_counter() - start) / rounds
+
+        for name, seconds in results.items():
+            print(f"   {name:<22} {seconds * 1000:8.1f} ms / call")
+        speedup = results["sequential (link)"] / results["concurrent (link)"]
+        print(f"   🚀 Speedup: {speedup:.1f}x")
+    finally:
+        await github_api.close()
+        await runner.cleanup()
+
+SAMPLE_REPO_DATA = RepoStats.from_github(
+    "repo",
+    {"name": "repo", "description": "A sample repository", "stargazers_count": 12345, "forks_count": 678},
+    [{"login": f"user{i}", "contributions": 100 - i} for i in range(5)],
+    [{"week": i, "total": (i * 7) % 23} for i in range(52)],
+    {"Python": 7000, "C": 2000, "Go": 550, "Rust": 300, "Shell": 150},
+    {"open_issues": 40, "closed_issues": 60, "total_issues": 100}
+)
+
+def measure_render(render, rounds: int):
+    """Time per call and peak bytes allocated by one call"""
+    render()  # Warm up (compiles templates)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        render()
+    seconds = (time.perf_counter() - start) / rounds
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+async def benchmark_templates(rounds: int = 2000):
+    """Compare precompiled dashboard templates with building all of the markup"""
+    print(f"\n📊 Dashboard templates: {rounds} renders each")
+    print("=" * 50)
+
+    svg_generator = SVGGenerator()
+    dashboards = [
+        ("repo_stats", svg_generator.generate_repo_stats_svg),
+        ("repobeats", svg_generator.generate_repobeats_style_svg),
+        ("modern", svg_generator.generate_modern_dark_dashboard)
+    ]
+    for style, generate in dashboards:
+        uncompiled_time, uncompiled_peak = measure_render(
+            lambda: svg_generator.render_uncompiled(style, SAMPLE_REPO_DATA, "default"), rounds)
+        template_time, template_peak = measure_render(lambda: generate(SAMPLE_REPO_DATA, "default"), rounds)
+        print(f"   {style}")
+        print(f"      uncompiled {uncompiled_time * 1e6:8.1f} µs   peak {uncompiled_peak / 1024:7.1f} KB")
+        print(f"      template   {template_time * 1e6:8.1f} µs   peak {template_peak / 1024:7.1f} KB")
+        print(f"      🚀 Speedup: {uncompiled_time / template_time:.1f}x")
+
+SAMPLE_CONTRIBUTOR_DATA = {
+    "username": "user0", "repository": "owner/repo", "total_commits": 420,
+    "activity": {f"2024-{month:02d}-{day:02d}": (month * day) % 7 for month in range(1, 13) for day in range(1, 29)}
+}
+
+async def benchmark_compact(rounds: int = 200):
+    """Report response sizes per endpoint, normal vs ?compact=1, raw and pre-compressed"""
+    print("\n📊 Compact SVG sizes (bytes)")
+    print("=" * 50)
+
+    svg_generator = SVGGenerator()
+    repo_data = SAMPLE_REPO_DATA
+    endpoints = [
+        ("embed", svg_generator.generate_repo_stats_svg(repo_data, "default")),
+        ("contributor", svg_generator.generate_contributor_stats_svg(SAMPLE_CONTRIBUTOR_DATA, "default")),
+        ("activity", svg_generator.generate_commit_activity_svg(repo_data, "default")),
+        ("repobeats", svg_generator.generate_repobeats_style_svg(repo_data, "default")),
+        ("modern", svg_generator.generate_modern_dark_dashboard(repo_data, "dark")),
+        ("text", svg_generator.generate_animated_text("Hello World"))
+    ]
+    print(f"   {'endpoint':<12}{'':>8}{'raw':>8}{'gzip':>8}{'br':>8}")
+    for endpoint, svg in endpoints:
+        compact = compact_svg(svg)
+        for label, content in (("normal", svg), ("compact", compact)):
+            raw = content.encode("utf-8")
+            variants = compress_variants(raw)
+            sizes = "".join(f"{len(variants[name]) if name in variants else '-':>8}" for name in ("gzip", "br"))
+            print(f"   {endpoint if label == 'normal' else '':<12}{label:>8}{len(raw):>8}{sizes}")
+        compact_time, _ = measure_render(lambda: compact_svg(svg), rounds)
+        print(f"   {'':<12}{'':>8}compacted in {compact_time * 1e6:.0f} µs")
+
+def measure_stream(chunks, batch_size: int = 8192):
+    """Time to the first batch, total time and peak bytes allocated while consuming batches"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if first is None and size >= batch_size:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first or total, total, peak
+
+async def benchmark_streaming():
+    """Compare first-byte latency and peak memory of whole vs streamed animated text renders"""
+    print("\n📊 Streaming renders: animated text")
+    print("=" * 50)
+
+    svg_generator = SVGGenerator()
+    for length in (100, 1000, 5000):
+        text = ("streaming " * length)[:length]
+        tracemalloc.start()
+        start = time.perf_counter()
+        svg_generator.generate_animated_text(text)
+        whole = time.perf_counter() - start
+        _, whole_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        first, total, stream_peak = measure_stream(svg_generator.iter_animated_text(text))
+        print(f"   {length} chars")
+        print(f"      whole    first byte {whole * 1000:8.2f} ms   peak {whole_peak / 1024:8.1f} KB")
+        print(f"      streamed first byte {first * 1000:8.2f} ms   peak {stream_peak / 1024:8.1f} KB   (all {total * 1000:.2f} ms)")
+
+async def benchmark_text(rounds: int = 20):
+    """Compare animated text render time and size per mode from 10 to 2,000 characters"""
+    print("\n📊 Animated text modes")
+    print("=" * 50)
+
+    svg_generator = SVGGenerator()
+    print(f"   {'chars':>6}{'mode':>8}{'render':>12}{'bytes':>10}")
+    for length in (10, 100, 500, 2000):
+        text = ("animated " * length)[:length]
+        for mode in ("chars", "reveal"):
+            seconds, _ = measure_render(lambda: svg_generator.generate_animated_text(text, mode=mode), rounds)
+            size = len(svg_generator.generate_animated_text(text, mode=mode).encode("utf-8"))
+            print(f"   {length:>6}{mode:>8}{seconds * 1e6:>9.0f} µs{size:>10}")
+
+def realistic_repo_stats(seed: int = 1) -> dict:
+    """The nested dict get_repository_stats returned before RepoStats, for a busy repository"""
+    rng = random.Random(seed)
+    base = "https://api.github.com/users"
+    contributors = [{
+        "login": f"contributor{i}", "id": 100000 + i, "node_id": f"MDQ6VXNlcj{100000 + i}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{100000 + i}?v=4", "gravatar_id": "",
+        "url": f"{base}/contributor{i}", "html_url": f"https://github.com/contributor{i}",
+        "followers_url": f"{base}/contributor{i}/followers",
+        "following_url": f"{base}/contributor{i}/following{{/other_user}}",
+        "gists_url": f"{base}/contributor{i}/gists{{/gist_id}}",
+        "starred_url": f"{base}/contributor{i}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{base}/contributor{i}/subscriptions",
+        "organizations_url": f"{base}/contributor{i}/orgs", "repos_url": f"{base}/contributor{i}/repos",
+        "events_url": f"{base}/contributor{i}/events{{/privacy}}",
+        "received_events_url": f"{base}/contributor{i}/received_events",
+        "type": "User", "site_admin": False, "contributions": 2000 // (i + 1)
+    } for i in range(5)]
+    commit_activity = []
+    for week in range(52):
+        days = [rng.randint(0, 40) for _ in range(7)]
+        commit_activity.append({"days": days, "total": sum(days), "week": 1672531200 + week * 604800})
+    languages = {"Python": 61.8, "C": 21.3, "Cython": 9.2, "Shell": 3.1, "C++": 2.9, "Makefile": 1.7}
+    return {
+        "repository": {"name": "repo", "full_name": "owner/repo", "description": "A sample repository",
+                       "stars": 12345, "forks": 678, "watchers": 12345, "created_at": "2015-04-01T12:00:00Z",
+                       "updated_at": "2024-05-01T08:30:00Z", "size": 98765},
+        "statistics": {"total_commits": sum(week["total"] for week in commit_activity),
+                       "total_contributors": 5, "open_issues": 40, "closed_issues": 60, "total_issues": 100,
+                       "open_prs": 12, "closed_prs": 88, "total_prs": 100},
+        "contributors": contributors,
+        "commit_activity": commit_activity,
+        "languages": {lang: share / sum(languages.values()) * 100 for lang, share in languages.items()},
+        "stats_pending": False,
+        "generated_at": "2024-05-01T08:30:00.123456"
+    }
+
+def realistic_repo_model(seed: int = 1) -> RepoStats:
+    """The same repository as realistic_repo_stats, as the typed model"""
+    data = realistic_repo_stats(seed)
+    repository, statistics = data["repository"], data["statistics"]
+    return RepoStats.from_github(
+        repository["name"],
+        {"name": repository["name"], "description": repository["description"],
+         "stargazers_count": repository["stars"], "forks_count": repository["forks"]},
+        data["contributors"], data["commit_activity"], data["languages"], statistics, data["stats_pending"]
+    )
+
+async def benchmark_codecs(rounds: int = 2000):
+    """Compare cache codecs on realistic repository stats, as the nested dict and as RepoStats"""
+    print("\n📊 Cache codecs (repository stats payload)")
+    print("=" * 50)
+
+    payloads = [
+        ("nested dict", realistic_repo_stats(), lambda value: value),
+        ("RepoStats", realistic_repo_model().to_dict(), RepoStats.from_dict)
+    ]
+    for label, data, load in payloads:
+        tracemalloc.start()
+        load(decode_value(CODECS["json"].encode(data)))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   {label} (peak {peak / 1024:.1f} KB to load)")
+        print(f"   {'codec':<14}{'encode':>10}{'decode':>10}{'bytes':>8}")
+        for name, codec in CODECS.items():
+            stored = codec.encode(data)
+            assert decode_value(stored) == data
+            start = time.perf_counter()
+            for _ in range(rounds):
+                codec.encode(data)
+            encode = (time.perf_counter() - start) / rounds
+            start = time.perf_counter()
+            for _ in range(rounds):
+                load(decode_value(stored))
+            decode = (time.perf_counter() - start) / rounds
+            size = len(stored.encode("utf-8") if isinstance(stored, str) else stored)
+            print(f"   {name:<14}{encode * 1e6:>7.1f} µs{decode * 1e6:>7.1f} µs{size:>8}")
+
+BENCHMARKS = {
+    "issues": benchmark_issues,
+    "templates": benchmark_templates,
+    "compact": benchmark_compact,
+    "streaming": benchmark_streaming,
+    "text": benchmark_text,
+    "codecs": benchmark_codecs,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run performance benchmarks")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    print("⏱️  GitHub Stats SVG API Benchmarks")
+    for name in args.benchmarks or BENCHMARKS:
+        asyncio.run(BENCHMARKS[name]())
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
-from fastapi import FastAPI, HTTPException, Response
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from email.utils import formatdate
+from pydantic import BaseModel, validator
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import re
+import time
+import uuid
 import uvicorn
 import os
 from dotenv import load_dotenv
 
 from src.github_api import GitHubAPI
-from src.svg_generator import SVGGenerator
-from src.cache_manager import CacheManager
+from src.svg_generator import ANIMATED_TEXT_MODES, SVGGenerator
+from src.cache_manager import CacheManager, RefreshSkipped, TransientValue, decode_text, revalidating
+from src.compression import choose_encoding, compress_variants
+from src.popularity import PopularityTracker
+from src.prewarmer import PreWarmer, parse_watchlist
+from src.repo_stats import RepoStats
+from src.render_pool import RenderPool, RenderQueueFull
+from src.svg_compact import compact_svg
 
 # Load environment variables
 load_dotenv()
@@ -27,9 +42,545 @@ app.add_middleware(
 )
 
 # Initialize components
-github_api = GitHubAPI(token=os.getenv("GITHUB_TOKEN"))
-svg_generator = SVGGenerator()
 cache_manager = CacheManager()
+github_api = GitHubAPI(
+    token=os.getenv("GITHUB_TOKEN"),
+    tokens=[t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()],
+    pool_limit=int(os.getenv("GITHUB_POOL_LIMIT", "100")),
+    pool_limit_per_host=int(os.getenv("GITHUB_POOL_LIMIT_PER_HOST", "30")),
+    keepalive_timeout=float(os.getenv("GITHUB_KEEPALIVE_TIMEOUT", "30")),
+    dns_cache_ttl=int(os.getenv("GITHUB_DNS_CACHE_TTL", "300")),
+    cache=cache_manager,
+    response_cache_ttl=int(os.getenv("GITHUB_RESPONSE_CACHE_TTL", "86400")),
+    use_graphql=os.getenv("GITHUB_USE_GRAPHQL", "false").lower() in ("1", "true", "yes"),
+    issue_count_source=os.getenv("GITHUB_ISSUE_COUNT_SOURCE", "link"),
+    low_budget_threshold=float(os.getenv("GITHUB_LOW_BUDGET_THRESHOLD", "0.2")),
+    critical_budget_threshold=float(os.getenv("GITHUB_CRITICAL_BUDGET_THRESHOLD", "0.05"))
+)
+svg_generator = SVGGenerator(fragment_cache_size=int(os.getenv("SVG_FRAGMENT_CACHE_SIZE", "1024")))
+
+# SVG rendering is CPU-bound, so it runs in a bounded worker pool instead of on the event loop
+render_pool = RenderPool(
+    executor=os.getenv("RENDER_EXECUTOR", "thread"),
+    workers=int(os.getenv("RENDER_WORKERS", "4")),
+    max_queue=int(os.getenv("RENDER_MAX_QUEUE", "64")),
+    queue_timeout=float(os.getenv("RENDER_QUEUE_TIMEOUT", "5"))
+)
+
+# Recent views per repository decide which refreshes keep running when rate limit budget is low
+popularity = PopularityTracker(
+    half_life=float(os.getenv("POPULARITY_HALF_LIFE", "3600")),
+    hot_score=float(os.getenv("POPULARITY_HOT_SCORE", "5"))
+)
+
+# Serve compact SVGs (CSS classes, shared shapes, no whitespace) of COMPACT_STYLES unless ?compact=0
+SVG_COMPACT = os.getenv("SVG_COMPACT", "false").lower() in ("1", "true", "yes")
+
+# Styles whose compact form is also smaller once gzip/brotli compressed; for the
+# others (repo_stats, contributor_stats) compression already removes the
+# repetition compaction targets, and the CSS classes it adds cost more than
+# they save, so they are always served as rendered
+COMPACT_STYLES = ("commit_activity", "repobeats_style", "modern_dashboard", "text_animation")
+
+# On cache misses, stream large SVGs to the client while they render (and into the cache)
+SVG_STREAMING = os.getenv("SVG_STREAMING", "true").lower() in ("1", "true", "yes")
+SVG_STREAM_BATCH_SIZE = int(os.getenv("SVG_STREAM_BATCH_SIZE", "8192"))
+
+# Animated text: "auto" types short texts character by character and reveals longer ones
+# with a single animated clip; per-character markup grows with the text, so it is capped
+TEXT_ANIMATION_MODE = os.getenv("TEXT_ANIMATION_MODE", "auto")
+TEXT_CHARS_MAX_LENGTH = int(os.getenv("TEXT_CHARS_MAX_LENGTH", "100"))
+TEXT_MAX_LENGTH = int(os.getenv("TEXT_MAX_LENGTH", "2000"))
+
+# Batch rendering: most badges per call, and how many cache misses render at once
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "200"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# With GraphQL enabled, batches and pre-warming fetch repositories this many per query
+GITHUB_GRAPHQL_BATCH_SIZE = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "20"))
+
+# Raw GitHub data is cached once per repository and shared by every SVG style/theme
+DATA_CACHE_TTL = int(os.getenv("DATA_CACHE_TTL", "3600"))
+
+# Data and SVGs built while GitHub is still computing statistics are only
+# cached briefly, and re-rendered as soon as the statistics are ready
+STATS_PENDING_TTL = int(os.getenv("STATS_PENDING_TTL", "60"))
+pending_renders: Dict[Tuple[str, str], Dict[str, Callable[[], Awaitable[Any]]]] = {}
+
+def cache_control(endpoint: str, default: str) -> str:
+    """Cache-Control header for an endpoint, overridable via CACHE_CONTROL_<ENDPOINT>"""
+    return os.getenv(f"CACHE_CONTROL_{endpoint.upper()}", default)
+
+# Browser / GitHub camo caching policy per endpoint
+CACHE_CONTROL = {
+    "embed": cache_control("embed", "public, max-age=3600, stale-while-revalidate=86400"),
+    "contributor": cache_control("contributor", "public, max-age=3600, stale-while-revalidate=86400"),
+    "activity": cache_control("activity", "public, max-age=3600, stale-while-revalidate=86400"),
+    "repobeats": cache_control("repobeats", "public, max-age=3600, stale-while-revalidate=86400"),
+    "modern": cache_control("modern", "public, max-age=3600, stale-while-revalidate=86400"),
+    # Animated text depends only on the query string, so it can be cached for long
+    "text": cache_control("text", "public, max-age=86400, stale-while-revalidate=604800")
+}
+
+# Repository SVG styles by cache key prefix, all rendered from the shared repository data
+REPOSITORY_STYLES = {
+    "repo_stats": svg_generator.generate_repo_stats_svg,
+    "commit_activity": svg_generator.generate_commit_activity_svg,
+    "repobeats_style": svg_generator.generate_repobeats_style_svg,
+    "modern_dashboard": svg_generator.generate_modern_dark_dashboard
+}
+
+# Repository SVG styles with a chunked render path, by their dashboard template
+STREAMING_STYLES = {
+    "repo_stats": "repo_stats",
+    "repobeats_style": "repobeats",
+    "modern_dashboard": "modern"
+}
+
+# Batch styles (named after their endpoints) -> repository SVG style and default theme
+BATCH_STYLES = {
+    "embed": ("repo_stats", "default"),
+    "activity": ("commit_activity", "default"),
+    "repobeats": ("repobeats_style", "default"),
+    "modern": ("modern_dashboard", "dark")
+}
+BATCH_FORMATS = ("json", "multipart", "sprite")
+
+# Characters GitHub allows in user, organization and repository names
+GITHUB_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+class BatchItem(BaseModel):
+    owner: str
+    repo: str
+    style: str = "embed"
+    theme: Optional[str] = None
+
+    @validator("owner", "repo")
+    def check_name(cls, value: str) -> str:
+        # Names end up in GitHub API paths, so "/", "?" or ".." must not get through
+        if not GITHUB_NAME_PATTERN.match(value) or not value.strip("."):
+            raise ValueError("must be a GitHub name (letters, digits, '-', '_' and '.')")
+        return value
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+    format: str = "json"
+    compact: Optional[bool] = None
+
+def load_prewarm_watchlist() -> list:
+    """Repositories to keep warm, from PREWARM_REPOSITORIES and PREWARM_REPOSITORIES_FILE"""
+    lines = os.getenv("PREWARM_REPOSITORIES", "").split(",")
+    watchlist_file = os.getenv("PREWARM_REPOSITORIES_FILE")
+    if watchlist_file:
+        try:
+            with open(watchlist_file) as f:
+                lines.extend(f.read().splitlines())
+        except OSError as e:
+            print(f"Warning: Could not read pre-warm watchlist {watchlist_file}: {e}")
+    return parse_watchlist(lines)
+
+# Styles/themes to re-render for each pre-warmed repository
+PREWARM_THEMES = [
+    theme.strip() for theme in os.getenv("PREWARM_THEMES", ",".join(svg_generator.themes)).split(",")
+    if theme.strip()
+]
+
+async def prewarm_repository(owner: str, repo: str) -> bool:
+    """Refresh a repository's data and re-render its SVGs before they expire"""
+    data_key = repo_data_key(owner, repo)
+    entry = await cache_manager.get_entry(data_key)
+    if entry is not None and entry["fresh_until"] - time.time() > prewarmer.interval:
+        return False  # Still fresh past the next pass (e.g. refreshed by another worker)
+
+    if await cache_manager.refresh_json(data_key, lambda: fetch_repository_data(owner, repo),
+                                        expire=DATA_CACHE_TTL) is None:
+        return False  # Another worker is refreshing it
+
+    await rerender_repository(owner, repo)
+    return True
+
+async def prewarm_repositories(repositories: List[Tuple[str, str]]) -> List[Any]:
+    """Pre-warm several repositories, fetching the data of those due in one batch
+
+    Returns one result per repository, as prewarm_repository would: True if
+    refreshed, False if there was nothing to do, or the exception raised.
+    """
+    entries = await cache_manager.get_entries([repo_data_key(owner, repo) for owner, repo in repositories])
+    results: Dict[Tuple[str, str], Any] = {}
+    due = []
+    for owner, repo in repositories:
+        entry = entries[repo_data_key(owner, repo)]
+        if entry is not None and entry["fresh_until"] - time.time() > prewarmer.interval:
+            results[(owner, repo)] = False
+            continue
+        try:
+            check_refresh_budget(owner, repo, background=True)
+            due.append((owner, repo))
+        except RefreshSkipped as e:
+            results[(owner, repo)] = e
+
+    try:
+        fetched = await github_api.get_repositories_stats(due) if due else []
+    except Exception as e:
+        results.update((repository, e) for repository in due)
+        fetched = []
+
+    for (owner, repo), repo_data in zip(due, fetched):
+        try:
+            results[(owner, repo)] = await store_repository_data(owner, repo, repo_data)
+            if results[(owner, repo)]:
+                await rerender_repository(owner, repo)
+        except Exception as e:
+            results[(owner, repo)] = e
+    return [results[repository] for repository in repositories]
+
+async def rerender_repository(owner: str, repo: str):
+    """Re-render every style of a repository in PREWARM_THEMES from its cached data"""
+    for style in REPOSITORY_STYLES:
+        for theme in PREWARM_THEMES:
+            cache_key = f"{style}:{owner}:{repo}:{theme}"
+            cache_key, render = svg_variant(
+                cache_key, repository_svg_render(style, owner, repo, theme), use_compact(cache_key)
+            )
+            render = track_pending(cache_key, render, (owner, repo))
+            await cache_manager.refresh_entry(cache_key, render, expire=3600, build=build_svg_entry)
+
+# Refreshes watched (and the most viewed) repositories ahead of expiry, spread over the interval
+prewarmer = PreWarmer(
+    prewarm_repository,
+    load_prewarm_watchlist(),
+    popularity,
+    interval=float(os.getenv("PREWARM_INTERVAL", str(DATA_CACHE_TTL * 5 // 6))),
+    popular_limit=int(os.getenv("PREWARM_POPULAR_LIMIT", "0")),
+    warm_many=prewarm_repositories,
+    # Without GraphQL a batch would cost the same REST requests, just in bursts
+    batch_size=GITHUB_GRAPHQL_BATCH_SIZE if github_api.use_graphql else 1
+)
+
+@app.on_event("startup")
+async def startup():
+    """Open the shared GitHub HTTP session, cache listeners and pre-warming"""
+    await github_api.start()
+    await cache_manager.start()
+    await prewarmer.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop pre-warming and close HTTP and cache connections"""
+    await prewarmer.close()
+    await github_api.close()
+    await cache_manager.close()
+    render_pool.close()
+
+def provisional(repo_data: RepoStats, value: Any) -> Any:
+    """Mark a value built from repository data as short-lived if its statistics are pending"""
+    if repo_data.stats_pending:
+        return TransientValue(value, STATS_PENDING_TTL)
+    return value
+
+async def on_stats_done(owner: str, repo: str, ready: bool):
+    """Re-render everything built while GitHub was computing this repository's statistics"""
+    renders = pending_renders.pop((owner, repo), {})
+    if not ready:
+        return  # Short-lived entries will be retried on the next view
+
+    await cache_manager.delete(repo_data_key(owner, repo))
+    for cache_key, render in renders.items():
+        try:
+            await cache_manager.refresh_entry(cache_key, render, expire=3600, build=build_svg_entry)
+        except Exception as e:
+            print(f"Warning: Re-rendering {cache_key} failed: {e}")
+
+github_api.stats_warmer.on_done = on_stats_done
+
+def check_refresh_budget(owner: str, repo: str, background: bool = False):
+    """Skip background refreshes of cold repositories when the GitHub budget runs low"""
+    if (background or revalidating.get()) and github_api.should_shed(popularity.is_hot(f"{owner}/{repo}")):
+        raise RefreshSkipped(f"GitHub rate limit budget low, keeping stale data for {owner}/{repo}")
+
+def repo_data_key(owner: str, repo: str) -> str:
+    """Data cache key of a repository
+
+    SVG keys are "{style}:{owner}:{repo}:{theme}" and ":" is allowed in a
+    path segment, so the prefix must not be an SVG style name.
+    """
+    return f"repo_model:{owner}:{repo}"
+
+async def fetch_repository_data(owner: str, repo: str) -> Any:
+    """Fetch repository statistics from GitHub for the data cache"""
+    check_refresh_budget(owner, repo)
+    repo_data = await github_api.get_repository_stats(owner, repo)
+    return provisional(repo_data, repo_data.to_dict())
+
+async def store_repository_data(owner: str, repo: str, repo_data: RepoStats) -> bool:
+    """Write statistics fetched for a repository to the data cache
+
+    Returns False if another worker is refreshing the entry already.
+    """
+    async def produce() -> Any:
+        return provisional(repo_data, repo_data.to_dict())
+    return await cache_manager.refresh_json(repo_data_key(owner, repo), produce, expire=DATA_CACHE_TTL) is not None
+
+async def prefetch_repository_data(repositories: List[Tuple[str, str]]):
+    """Fetch the repositories missing from the data cache in batched GraphQL queries
+
+    Otherwise every render would fetch its repository with a query of its
+    own. Only used with GraphQL enabled; repositories that fail here are
+    left to their renders, which fetch them as usual.
+    """
+    if not github_api.use_graphql:
+        return
+    entries = await cache_manager.get_entries([repo_data_key(owner, repo) for owner, repo in repositories])
+    missing = [(owner, repo) for owner, repo in repositories if entries[repo_data_key(owner, repo)] is None]
+    if len(missing) < 2:
+        return
+
+    async def fetch(chunk: List[Tuple[str, str]]):
+        try:
+            fetched = await github_api.get_repositories_stats(chunk)
+        except Exception as e:
+            print(f"Warning: Batched fetch of {len(chunk)} repositories failed: {e}")
+            return
+        await asyncio.gather(*(store_repository_data(owner, repo, repo_data)
+                               for (owner, repo), repo_data in zip(chunk, fetched)), return_exceptions=True)
+
+    await asyncio.gather(*(fetch(missing[i:i + GITHUB_GRAPHQL_BATCH_SIZE])
+                           for i in range(0, len(missing), GITHUB_GRAPHQL_BATCH_SIZE)))
+
+async def get_repository_data(owner: str, repo: str) -> RepoStats:
+    """Get repository statistics from the data cache, fetching from GitHub on a miss"""
+    return RepoStats.from_dict(await cache_manager.get_or_set_json(
+        repo_data_key(owner, repo), lambda: fetch_repository_data(owner, repo), expire=DATA_CACHE_TTL
+    ))
+
+def repository_svg_render(style: str, owner: str, repo: str, theme: str) -> Callable[[], Awaitable[Any]]:
+    """Build the render function for one repository SVG style and theme"""
+    async def render() -> Any:
+        # Fetch repository data (shared across styles and themes)
+        repo_data = await get_repository_data(owner, repo)
+        svg_content = await render_pool.run(REPOSITORY_STYLES[style], repo_data, theme)
+        return provisional(repo_data, svg_content)
+    return render
+
+def repository_svg_stream(style: str, owner: str, repo: str, theme: str) -> Optional[Callable[[], Awaitable[Any]]]:
+    """Build the streaming render function for a repository SVG style, if it has one"""
+    if style not in STREAMING_STYLES:
+        return None
+
+    async def stream() -> Any:
+        repo_data = await get_repository_data(owner, repo)
+        chunks = render_pool.stream(svg_generator.iter_dashboard, STREAMING_STYLES[style], repo_data, theme,
+                                    batch_size=SVG_STREAM_BATCH_SIZE)
+        return provisional(repo_data, chunks)
+    return stream
+
+async def get_contributor_data(owner: str, repo: str, username: str) -> dict:
+    """Get contributor statistics from the data cache, fetching from GitHub on a miss"""
+    async def fetch():
+        check_refresh_budget(owner, repo)
+        return await github_api.get_contributor_stats(owner, repo, username)
+
+    return await cache_manager.get_or_set_json(
+        f"contributor_data:{owner}:{repo}:{username}", fetch, expire=DATA_CACHE_TTL
+    )
+
+def text_animation_mode(text: str, mode: Optional[str]) -> str:
+    """Resolve the animated text mode, enforcing the length limits"""
+    if len(text) > TEXT_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Text is limited to {TEXT_MAX_LENGTH} characters")
+
+    mode = mode or TEXT_ANIMATION_MODE
+    if mode == "auto":
+        return "chars" if len(text) <= TEXT_CHARS_MAX_LENGTH else "reveal"
+    if mode not in ANIMATED_TEXT_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode {mode}, expected auto or {' or '.join(ANIMATED_TEXT_MODES)}")
+    if mode == "chars" and len(text) > TEXT_CHARS_MAX_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"mode=chars is limited to {TEXT_CHARS_MAX_LENGTH} characters, use mode=reveal for longer text"
+        )
+    return mode
+
+def svg_entry(svg_content: str) -> dict:
+    """Build the cached SVG entry, computing its validators and compressed variants once"""
+    raw = svg_content.encode('utf-8')
+    return {
+        "value": raw,
+        "etag": '"' + hashlib.sha1(raw).hexdigest() + '"',
+        "last_modified": formatdate(usegmt=True),
+        **compress_variants(raw)
+    }
+
+async def build_svg_entry(svg_content: str) -> dict:
+    """Build the cached SVG entry in the render pool (compression is CPU-bound too)"""
+    return await render_pool.run(svg_entry, svg_content)
+
+def use_compact(cache_key: str, compact: Optional[bool] = None) -> bool:
+    """Whether to serve the compact form of an SVG: requested (or SVG_COMPACT) and its style gains from it"""
+    if compact is None:
+        compact = SVG_COMPACT
+    return compact and cache_key.split(":", 1)[0] in COMPACT_STYLES
+
+def svg_variant(cache_key: str, render: Callable[[], Awaitable[Any]],
+                compact: bool) -> Tuple[str, Callable[[], Awaitable[Any]]]:
+    """Cache key and render function for the normal or compact form of an SVG"""
+    if not compact:
+        return cache_key, render
+
+    async def compact_render() -> Any:
+        svg_content = await render()
+        if isinstance(svg_content, TransientValue):
+            svg_content.value = await render_pool.run(compact_svg, svg_content.value)
+            return svg_content
+        return await render_pool.run(compact_svg, svg_content)
+    return f"{cache_key}:compact", compact_render
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+def mark_pending(cache_key: str, render: Callable[[], Awaitable[Any]],
+                 repository: Optional[Tuple[str, str]]):
+    """Re-render a placeholder as soon as GitHub finishes computing the statistics
+
+    Only repositories this worker's stats warmer is polling get a callback;
+    placeholders built from another worker's pending data just expire.
+    """
+    if repository and repository in github_api.stats_warmer.pending:
+        pending_renders.setdefault(repository, {})[cache_key] = render
+
+def track_pending(cache_key: str, render: Callable[[], Awaitable[Any]],
+                  repository: Optional[Tuple[str, str]]) -> Callable[[], Awaitable[Any]]:
+    """Wrap a render so placeholders built from pending statistics are re-rendered later"""
+    async def tracked_render():
+        svg_content = await render()
+        if isinstance(svg_content, TransientValue):
+            mark_pending(cache_key, render, repository)
+        return svg_content
+    return tracked_render
+
+async def stream_svg(cache_key: str, stream: Callable[[], Awaitable[Any]], render: Callable[[], Awaitable[Any]],
+                     cache_control_header: str, repository: Optional[Tuple[str, str]]) -> Optional[Response]:
+    """On a cold miss, stream an SVG to the client while it renders, tee-ing it into the cache
+
+    The chunks are produced by the key's regular single-flight fill, so
+    concurrent requests wait for the cached entry instead of rendering
+    again, and the entry is completed even if this client disconnects.
+    Returns None when there was nothing to stream (the entry exists or
+    another fill produced it), leaving the caller to serve the entry.
+    """
+    if cache_key in cache_manager.inflight or await cache_manager.get_entry(cache_key) is not None:
+        return None
+
+    # Streamed chunks, then None (or the error) at the end; the finished fill comes last
+    chunks: asyncio.Queue = asyncio.Queue()
+    transient = {}
+
+    async def produce() -> Any:
+        try:
+            value = await stream()
+            if isinstance(value, TransientValue):
+                transient["expire"] = value.expire
+                value = value.value
+            parts = []
+            async for chunk in value:
+                parts.append(chunk)
+                chunks.put_nowait(chunk)
+        except BaseException as e:
+            chunks.put_nowait(e)
+            raise
+        chunks.put_nowait(None)
+
+        svg_content = "".join(parts)
+        if transient:
+            mark_pending(cache_key, render, repository)
+            return TransientValue(svg_content, transient["expire"])
+        return svg_content
+
+    def fill_done(done: asyncio.Future):
+        chunks.put_nowait(done)
+        if not done.cancelled():
+            done.exception()  # Streamed errors reach the client; don't log them twice
+
+    fill = asyncio.ensure_future(
+        cache_manager.get_or_set_entry(cache_key, produce, expire=3600, build=build_svg_entry)
+    )
+    fill.add_done_callback(fill_done)
+
+    # Wait for the first chunk so errors before any output still get an error status
+    first = await chunks.get()
+    if isinstance(first, BaseException):
+        raise first
+    if isinstance(first, asyncio.Future):
+        first.result()  # Filled without streaming (e.g. by another worker)
+        return None
+
+    async def body():
+        chunk = first
+        while isinstance(chunk, str):
+            yield chunk
+            chunk = await chunks.get()
+        if isinstance(chunk, BaseException):
+            raise chunk  # Abort the response rather than end it with a truncated SVG
+
+    headers = {"Cache-Control": cache_control_header, "Vary": "Accept-Encoding"}
+    if transient:
+        headers["Cache-Control"] = f"public, max-age={STATS_PENDING_TTL}"
+    return StreamingResponse(body(), media_type="image/svg+xml", headers=headers)
+
+async def serve_svg(request: Request, cache_key: str, render: Callable[[], Awaitable[Any]],
+                    cache_control_header: str, repository: Optional[Tuple[str, str]] = None,
+                    compact: Optional[bool] = None,
+                    stream: Optional[Callable[[], Awaitable[Any]]] = None) -> Response:
+    """Serve an SVG from cache (rendering once on a miss), answering 304 when unchanged
+
+    `stream` is an optional chunked version of `render`, used to stream
+    cold misses (compact SVGs are rewritten whole, so they never stream).
+    """
+    if repository:
+        popularity.record("/".join(repository))
+
+    compact = use_compact(cache_key, compact)
+    cache_key, render = svg_variant(cache_key, render, compact)
+    tracked_render = track_pending(cache_key, render, repository)
+    try:
+        if stream is not None and SVG_STREAMING and not compact:
+            response = await stream_svg(cache_key, stream, render, cache_control_header, repository)
+            if response is not None:
+                return response
+        entry = await cache_manager.get_or_set_entry(cache_key, tracked_render, expire=3600, build=build_svg_entry)  # 1 hour cache
+    except RenderQueueFull as e:
+        # Shed load instead of queueing renders without bound
+        return Response(content=str(e), status_code=503, media_type="text/plain",
+                        headers={"Retry-After": str(int(render_pool.queue_timeout) or 1)})
+    if "etag" not in entry:
+        # Entry written before validators were stored
+        entry = svg_entry(decode_text(entry["value"]))
+
+    headers = {
+        "ETag": decode_text(entry["etag"]),
+        "Last-Modified": decode_text(entry["last_modified"]),
+        "Cache-Control": cache_control_header,
+        "Vary": "Accept-Encoding"
+    }
+    if entry.get("transient"):
+        # Don't let clients hold on to a placeholder
+        headers["Cache-Control"] = f"public, max-age={STATS_PENDING_TTL}"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    # Serve a pre-compressed variant when the client accepts one
+    encoding = choose_encoding(request.headers.get("accept-encoding"), entry)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return Response(content=entry[encoding], media_type="image/svg+xml", headers=headers)
+
+    return Response(content=entry["value"], media_type="image/svg+xml", headers=headers)
 
 @app.get("/")
 async def root():
@@ -42,161 +593,247 @@ async def root():
             "/api/activity/{owner}/{repo}.svg": "Generate commit activity chart SVG",
             "/api/repobeats/{owner}/{repo}.svg": "Generate RepoBeats-style comprehensive dashboard SVG",
             "/api/modern/{owner}/{repo}.svg": "Generate modern dark dashboard SVG",
-            "/api/text": "Generate animated text SVG with typing effect"
+            "/api/text": "Generate animated text SVG with typing effect",
+            "/api/batch": "Render many repository SVGs in one call (POST, JSON, multipart or sprite)",
+            "/api/metrics": "Cache and runtime metrics"
         }
     }
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Expose cache and upstream metrics"""
+    return {
+        "cache": cache_manager.stats(),
+        "github": github_api.stats(),
+        "popularity": popularity.stats(),
+        "prewarm": prewarmer.stats(),
+        "render": render_pool.stats(),
+        "svg": svg_generator.stats()
+    }
+
+@app.post("/api/batch")
+async def get_batch(batch: BatchRequest):
+    """Render many repository SVGs in one call
+
+    Cached badges are read with one multi-get; only the misses are
+    rendered (fetching from GitHub), at most BATCH_CONCURRENCY at a time.
+    With GraphQL enabled, the misses' repository data is fetched up front,
+    GITHUB_GRAPHQL_BATCH_SIZE repositories per query.
+    Returns a JSON bundle, a multipart/mixed bundle or one sprite SVG.
+    Failed badges are reported per item instead of failing the batch (for
+    a sprite, as the X-Batch-Failed header of item indexes).
+    """
+    if batch.format not in BATCH_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {batch.format}, expected {' or '.join(BATCH_FORMATS)}")
+    if len(batch.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch is limited to {BATCH_MAX_ITEMS} items")
+    for item in batch.items:
+        if item.style not in BATCH_STYLES:
+            raise HTTPException(status_code=400, detail=f"Unknown style {item.style}, expected {' or '.join(BATCH_STYLES)}")
+
+    item_keys = []
+    badges: Dict[str, Tuple[BatchItem, Callable[[], Awaitable[Any]]]] = {}
+    for item in batch.items:
+        style, default_theme = BATCH_STYLES[item.style]
+        item.theme = item.theme or default_theme
+        cache_key = f"{style}:{item.owner}:{item.repo}:{item.theme}"
+        cache_key, render = svg_variant(
+            cache_key, repository_svg_render(style, item.owner, item.repo, item.theme),
+            use_compact(cache_key, batch.compact)
+        )
+        item_keys.append(cache_key)
+        badges.setdefault(cache_key, (item, render))
+
+    for repository in {(item.owner, item.repo) for item in batch.items}:
+        popularity.record("/".join(repository))
+
+    entries = await cache_manager.get_entries(list(badges))
+    # Fetch the data of uncached badges' repositories together rather than one render at a time
+    await prefetch_repository_data(list(dict.fromkeys(
+        (badges[key][0].owner, badges[key][0].repo) for key, entry in entries.items() if entry is None
+    )))
+    renders = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def load(cache_key: str) -> dict:
+        entry = entries[cache_key]
+        if entry is not None and time.time() < entry["fresh_until"]:
+            return entry
+        # Misses (and stale entries, which are served while they refresh) go through the usual fill
+        item, render = badges[cache_key]
+        async with renders:
+            return await cache_manager.get_or_set_entry(
+                cache_key, track_pending(cache_key, render, (item.owner, item.repo)),
+                expire=3600, build=build_svg_entry
+            )
+
+    results = dict(zip(badges, await asyncio.gather(*(load(key) for key in badges), return_exceptions=True)))
+
+    if batch.format == "sprite":
+        sprite_badges = []
+        view_ids = set()
+        failed = []
+        for index, (item, cache_key) in enumerate(zip(batch.items, item_keys)):
+            if isinstance(results[cache_key], BaseException):
+                failed.append(str(index))
+                continue
+            # Repeated or equally sanitized items get the item index appended
+            view_id = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{item.owner}-{item.repo}-{item.style}-{item.theme}")
+            while view_id in view_ids:
+                view_id = f"{view_id}-{index}"
+            view_ids.add(view_id)
+            sprite_badges.append((view_id, decode_text(results[cache_key]["value"])))
+        sprite = svg_generator.generate_sprite_svg(sprite_badges)
+        # Failed badges are left out of the sprite; their item indexes are listed here
+        headers = {"X-Batch-Failed": ",".join(failed)} if failed else None
+        return Response(content=sprite, media_type="image/svg+xml", headers=headers)
+
+    if batch.format == "multipart":
+        boundary = uuid.uuid4().hex
+        parts = []
+        for item, cache_key in zip(batch.items, item_keys):
+            result = results[cache_key]
+            location = f"Content-Location: /api/{item.style}/{item.owner}/{item.repo}.svg?theme={item.theme}"
+            if isinstance(result, BaseException):
+                parts.append(f"Content-Type: text/plain\r\n{location}\r\n\r\n{result}")
+            else:
+                etag = f"\r\nETag: {decode_text(result['etag'])}" if "etag" in result else ""
+                parts.append(f"Content-Type: image/svg+xml\r\n{location}{etag}\r\n\r\n{decode_text(result['value'])}")
+        body = "".join(f"--{boundary}\r\n{part}\r\n" for part in parts) + f"--{boundary}--\r\n"
+        return Response(content=body, media_type=f"multipart/mixed; boundary={boundary}")
+
+    items = []
+    for item, cache_key in zip(batch.items, item_keys):
+        result = results[cache_key]
+        bundled = item.dict()
+        if isinstance(result, BaseException):
+            bundled["error"] = str(result)
+        else:
+            bundled["svg"] = decode_text(result["value"])
+            if "etag" in result:
+                bundled["etag"] = decode_text(result["etag"])
+        items.append(bundled)
+    return {"items": items}
+
 @app.get("/api/embed/{owner}/{repo}.svg")
-async def get_repo_stats_svg(owner: str, repo: str, theme: str = "default"):
+async def get_repo_stats_svg(request: Request, owner: str, repo: str, theme: str = "default",
+                             compact: Optional[bool] = None):
     """Generate SVG with repository statistics"""
     try:
-        # Check cache first
+        render = repository_svg_render("repo_stats", owner, repo, theme)
+        stream = repository_svg_stream("repo_stats", owner, repo, theme)
+
+        # Serve from cache, rendering once per key on a miss
         cache_key = f"repo_stats:{owner}:{repo}:{theme}"
-        cached_svg = await cache_manager.get(cache_key)
-        if cached_svg:
-            return Response(content=cached_svg, media_type="image/svg+xml")
-        
-        # Fetch repository data
-        repo_data = await github_api.get_repository_stats(owner, repo)
-        
-        # Generate SVG
-        svg_content = svg_generator.generate_repo_stats_svg(repo_data, theme)
-        
-        # Cache the result
-        await cache_manager.set(cache_key, svg_content, expire=3600)  # 1 hour cache
-        
-        return Response(content=svg_content, media_type="image/svg+xml")
+        return await serve_svg(request, cache_key, render, CACHE_CONTROL["embed"], (owner, repo), compact, stream)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/contributor/{owner}/{repo}/{username}.svg")
-async def get_contributor_stats_svg(owner: str, repo: str, username: str, theme: str = "default"):
+async def get_contributor_stats_svg(request: Request, owner: str, repo: str, username: str, theme: str = "default",
+                                    compact: Optional[bool] = None):
     """Generate SVG with contributor statistics"""
     try:
-        # Check cache first
+        async def render() -> str:
+            # Fetch contributor data (shared across themes)
+            contributor_data = await get_contributor_data(owner, repo, username)
+            return await render_pool.run(svg_generator.generate_contributor_stats_svg, contributor_data, theme)
+
+        # Serve from cache, rendering once per key on a miss
         cache_key = f"contributor_stats:{owner}:{repo}:{username}:{theme}"
-        cached_svg = await cache_manager.get(cache_key)
-        if cached_svg:
-            return Response(content=cached_svg, media_type="image/svg+xml")
-        
-        # Fetch contributor data
-        contributor_data = await github_api.get_contributor_stats(owner, repo, username)
-        
-        # Generate SVG
-        svg_content = svg_generator.generate_contributor_stats_svg(contributor_data, theme)
-        
-        # Cache the result
-        await cache_manager.set(cache_key, svg_content, expire=3600)  # 1 hour cache
-        
-        return Response(content=svg_content, media_type="image/svg+xml")
+        return await serve_svg(request, cache_key, render, CACHE_CONTROL["contributor"], (owner, repo), compact)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/activity/{owner}/{repo}.svg")
-async def get_commit_activity_svg(owner: str, repo: str, theme: str = "default"):
+async def get_commit_activity_svg(request: Request, owner: str, repo: str, theme: str = "default",
+                                  compact: Optional[bool] = None):
     """Generate SVG with commit activity chart"""
     try:
-        # Check cache first
-        cache_key = f"commit_activity:{owner}:{repo}:{theme}"
-        cached_svg = await cache_manager.get(cache_key)
-        if cached_svg:
-            return Response(content=cached_svg, media_type="image/svg+xml")
-
-        # Fetch repository data
-        repo_data = await github_api.get_repository_stats(owner, repo)
+        render = repository_svg_render("commit_activity", owner, repo, theme)
 
-        # Generate SVG
-        svg_content = svg_generator.generate_commit_activity_svg(repo_data, theme)
-
-        # Cache the result
-        await cache_manager.set(cache_key, svg_content, expire=3600)  # 1 hour cache
-
-        return Response(content=svg_content, media_type="image/svg+xml")
+        # Serve from cache, rendering once per key on a miss
+        cache_key = f"commit_activity:{owner}:{repo}:{theme}"
+        return await serve_svg(request, cache_key, render, CACHE_CONTROL["activity"], (owner, repo), compact)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/repobeats/{owner}/{repo}.svg")
-async def get_repobeats_style_svg(owner: str, repo: str, theme: str = "default"):
+async def get_repobeats_style_svg(request: Request, owner: str, repo: str, theme: str = "default",
+                                  compact: Optional[bool] = None):
     """Generate RepoBeats-style comprehensive dashboard SVG"""
     try:
-        # Check cache first
-        cache_key = f"repobeats_style:{owner}:{repo}:{theme}"
-        cached_svg = await cache_manager.get(cache_key)
-        if cached_svg:
-            return Response(content=cached_svg, media_type="image/svg+xml")
-
-        # Fetch repository data
-        repo_data = await github_api.get_repository_stats(owner, repo)
+        render = repository_svg_render("repobeats_style", owner, repo, theme)
+        stream = repository_svg_stream("repobeats_style", owner, repo, theme)
 
-        # Generate SVG
-        svg_content = svg_generator.generate_repobeats_style_svg(repo_data, theme)
-
-        # Cache the result
-        await cache_manager.set(cache_key, svg_content, expire=3600)  # 1 hour cache
-
-        return Response(content=svg_content, media_type="image/svg+xml")
+        # Serve from cache, rendering once per key on a miss
+        cache_key = f"repobeats_style:{owner}:{repo}:{theme}"
+        return await serve_svg(request, cache_key, render, CACHE_CONTROL["repobeats"], (owner, repo), compact, stream)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/modern/{owner}/{repo}.svg")
-async def get_modern_dark_dashboard(owner: str, repo: str, theme: str = "dark"):
+async def get_modern_dark_dashboard(request: Request, owner: str, repo: str, theme: str = "dark",
+                                    compact: Optional[bool] = None):
     """Generate modern dark dashboard SVG"""
     try:
-        # Check cache first
-        cache_key = f"modern_dashboard:{owner}:{repo}:{theme}"
-        cached_svg = await cache_manager.get(cache_key)
-        if cached_svg:
-            return Response(content=cached_svg, media_type="image/svg+xml")
-
-        # Fetch repository data
-        repo_data = await github_api.get_repository_stats(owner, repo)
-
-        # Generate SVG
-        svg_content = svg_generator.generate_modern_dark_dashboard(repo_data, theme)
+        render = repository_svg_render("modern_dashboard", owner, repo, theme)
+        stream = repository_svg_stream("modern_dashboard", owner, repo, theme)
 
-        # Cache the result
-        await cache_manager.set(cache_key, svg_content, expire=3600)  # 1 hour cache
-
-        return Response(content=svg_content, media_type="image/svg+xml")
+        # Serve from cache, rendering once per key on a miss
+        cache_key = f"modern_dashboard:{owner}:{repo}:{theme}"
+        return await serve_svg(request, cache_key, render, CACHE_CONTROL["modern"], (owner, repo), compact, stream)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/text")
 async def get_animated_text(
+    request: Request,
     text: str = "Hello World",
     font_size: int = 24,
     color: str = "#ffffff",
     bg_color: str = "#000000",
     speed: float = 0.5,
-    theme: str = "default"
+    theme: str = "default",
+    mode: Optional[str] = None,
+    compact: Optional[bool] = None
 ):
     """Generate animated text SVG with typing effect"""
+    mode = text_animation_mode(text, mode)
     try:
-        # Check cache first
-        cache_key = f"text_animation:{text}:{font_size}:{color}:{bg_color}:{speed}:{theme}"
-        cached_svg = await cache_manager.get(cache_key)
-        if cached_svg:
-            return Response(content=cached_svg, media_type="image/svg+xml")
-
-        # Generate animated text SVG
-        svg_content = svg_generator.generate_animated_text(
-            text=text,
-            font_size=font_size,
-            color=color,
-            bg_color=bg_color,
-            speed=speed,
-            theme=theme
-        )
-
-        # Cache the result
-        await cache_manager.set(cache_key, svg_content, expire=3600)  # 1 hour cache
-
-        return Response(content=svg_content, media_type="image/svg+xml")
+        async def render() -> str:
+            # Generate animated text SVG
+            return await render_pool.run(
+                svg_generator.generate_animated_text,
+                text=text,
+                font_size=font_size,
+                color=color,
+                bg_color=bg_color,
+                speed=speed,
+                theme=theme,
+                mode=mode
+            )
+
+        async def stream() -> Any:
+            return render_pool.stream(
+                svg_generator.iter_animated_text,
+                text=text,
+                font_size=font_size,
+                color=color,
+                bg_color=bg_color,
+                speed=speed,
+                theme=theme,
+                mode=mode,
+                batch_size=SVG_STREAM_BATCH_SIZE
+            )
+
+        # Serve from cache, rendering once per key on a miss
+        cache_key = f"text_animation:{text}:{font_size}:{color}:{bg_color}:{speed}:{theme}:{mode}"
+        return await serve_svg(request, cache_key, render, CACHE_CONTROL["text"], compact=compact, stream=stream)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,108 @@
+import json
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+class Codec:
+    """Serializes structured cache values to stored bytes and back
+
+    Every codec except plain JSON prefixes its output with a one-byte tag
+    (JSON text never starts with a control byte), so a value decodes
+    correctly whichever codec wrote it and namespaces can switch codecs
+    without flushing the cache.
+    """
+
+    def __init__(self, name: str, tag: bytes, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]):
+        self.name = name
+        self.tag = tag
+        self.dumps = dumps
+        self.loads = loads
+
+    def encode(self, value: Any):
+        return self.tag + self.dumps(value)
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+class JSONCodec(Codec):
+    """Compact JSON text, the format the cache has always stored"""
+
+    def __init__(self):
+        super().__init__("json", b"", _json_dumps, json.loads)
+
+    def encode(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+def _compressed(name: str, tag: bytes, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any],
+                compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]) -> Codec:
+    return Codec(name, tag, lambda value: compress(dumps(value)), lambda data: loads(decompress(data)))
+
+CODECS: Dict[str, Codec] = {
+    "json": JSONCodec(),
+    "json+zlib": _compressed("json+zlib", b"\x01", _json_dumps, json.loads,
+                             lambda data: zlib.compress(data, 6), zlib.decompress)
+}
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value)
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, strict_map_key=False)
+
+if MSGPACK_AVAILABLE:
+    CODECS["msgpack"] = Codec("msgpack", b"\x02", _msgpack_dumps, _msgpack_loads)
+    CODECS["msgpack+zlib"] = _compressed("msgpack+zlib", b"\x03", _msgpack_dumps, _msgpack_loads,
+                                         lambda data: zlib.compress(data, 6), zlib.decompress)
+
+if ZSTD_AVAILABLE:
+    _zstd_compress = zstandard.ZstdCompressor(level=3).compress
+    _zstd_decompress = zstandard.ZstdDecompressor().decompress
+    CODECS["json+zstd"] = _compressed("json+zstd", b"\x04", _json_dumps, json.loads,
+                                      _zstd_compress, _zstd_decompress)
+    if MSGPACK_AVAILABLE:
+        CODECS["msgpack+zstd"] = _compressed("msgpack+zstd", b"\x05", _msgpack_dumps, _msgpack_loads,
+                                             _zstd_compress, _zstd_decompress)
+
+CODECS_BY_TAG = {codec.tag: codec for codec in CODECS.values() if codec.tag}
+
+def decode_value(data) -> Any:
+    """Decode a stored structured value, whichever codec wrote it"""
+    if isinstance(data, str):
+        return json.loads(data)
+    codec = CODECS_BY_TAG.get(data[:1])
+    if codec is None:
+        return json.loads(data)
+    return codec.loads(data[1:])
+
+def parse_codecs(spec: str) -> Dict[str, Codec]:
+    """Parse "namespace=codec,..." into codecs by key namespace, skipping unavailable codecs"""
+    codecs = {}
+    for item in spec.split(","):
+        namespace, _, name = item.strip().partition("=")
+        if not namespace or not name:
+            continue
+        codec = CODECS.get(name.strip())
+        if codec is None:
+            print(f"Warning: Cache codec {name.strip()} is not available, using json for {namespace}")
+            continue
+        codecs[namespace.strip()] = codec
+    return codecs
+
+def get_codec(name: Optional[str]) -> Codec:
+    """Look up a codec by name, falling back to JSON"""
+    codec = CODECS.get(name or "json")
+    if codec is None:
+        print(f"Warning: Cache codec {name} is not available, using json")
+        return CODECS["json"]
+    return codec
@@ -1,102 +1,621 @@
 import asyncio
-import json
+import inspect
 import os
-from typing import Optional
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 import hashlib
 
+from .cache_codecs import decode_value, get_codec, parse_codecs
+from .circuit_breaker import CircuitBreaker
+from .memory_cache import MemoryCache
+
 try:
     import redis.asyncio as redis
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
 
+# Deletes the fill lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# True inside a background refresh, so nested reads fetch fresh data
+revalidating: ContextVar[bool] = ContextVar("revalidating", default=False)
+
+class TransientValue:
+    """A produced value that should only stay fresh for a short time
+
+    Producers return this for results built from incomplete upstream data
+    (e.g. statistics GitHub is still computing) so they are refreshed soon.
+    """
+
+    def __init__(self, value: Any, expire: int):
+        self.value = value
+        self.expire = expire
+
+class RefreshSkipped(Exception):
+    """Raised by a producer to skip a background refresh and keep serving the stale entry"""
+
+# GitHub responses and contributor data are the bulk of cached structured data;
+# msgpack+zstd stores them in about a fifth of the bytes of JSON and is faster both ways.
+# RepoStats entries are already small, so they skip compression
+DEFAULT_CACHE_CODECS = "repo_model=msgpack,contributor_data=msgpack+zstd,github_response=msgpack+zstd"
+
+def decode_text(value) -> str:
+    """Decode a text field of a cache entry (Redis returns bytes)"""
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+def _text_entry(value: str) -> Dict[str, Any]:
+    return {"value": value}
+
 class CacheManager:
     def __init__(self):
         self.redis_client = None
-        self.memory_cache = {}
-        self.cache_ttl = {}
+        self.pubsub_client = None
+        self.memory_cache = MemoryCache(
+            max_bytes=int(os.getenv("MEMORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            max_entries=int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "0"))
+        )
+
+        # Single-flight state: one in-process fill task per key, plus a
+        # Redis lock so other workers wait for the same fill
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.lock_timeout = float(os.getenv("CACHE_LOCK_TIMEOUT", "30"))
+        self.lock_poll_interval = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.1"))
+
+        # How long entries stay servable (while being refreshed) past their soft TTL
+        self.stale_ttl = int(os.getenv("CACHE_STALE_TTL", "604800"))
+
+        # With Redis configured the memory cache acts as a short-lived L1 in
+        # front of it; pub/sub invalidation keeps L1 coherent across workers
+        self.l1_ttl = int(os.getenv("CACHE_L1_TTL", "60"))
+        self.invalidation_channel = os.getenv("CACHE_INVALIDATION_CHANNEL", "")
+        self.instance_id = uuid.uuid4().hex
+        self.invalidation_task: Optional[asyncio.Task] = None
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.pool_exhausted = 0
+        self.command_errors = 0
         
+        # Structured values are serialized by the codec of their key namespace
+        # (the part before the first ":"), e.g. CACHE_CODECS=repo_model=msgpack+zlib
+        self.default_codec = get_codec(os.getenv("CACHE_CODEC", "json"))
+        self.codecs = parse_codecs(os.getenv("CACHE_CODECS", DEFAULT_CACHE_CODECS))
+
+        # After this many Redis errors in a row the cache runs from memory
+        # alone, probing Redis in the background until it answers again
+        self.breaker = CircuitBreaker(
+            "Redis", self._probe_redis,
+            failure_threshold=int(os.getenv("REDIS_FAILURE_THRESHOLD", "5")),
+            probe_interval=float(os.getenv("REDIS_PROBE_INTERVAL", "5"))
+        )
+
         # Try to connect to Redis if available
         if REDIS_AVAILABLE:
             redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            connect_timeout = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.25"))
             try:
-                self.redis_client = redis.from_url(redis_url)
+                # Short timeouts so a slow Redis costs milliseconds, not seconds, before
+                # falling back; with every pooled connection busy, calls fall back at once
+                pool = redis.ConnectionPool.from_url(
+                    redis_url,
+                    max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64")),
+                    socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25")),
+                    socket_connect_timeout=connect_timeout,
+                    socket_keepalive=True,
+                    health_check_interval=30
+                )
+                self.redis_client = redis.Redis(connection_pool=pool)
+                if self.invalidation_channel:
+                    # Subscriptions sit idle between messages, so they get no read timeout
+                    self.pubsub_client = redis.from_url(redis_url, socket_connect_timeout=connect_timeout)
             except Exception:
                 print("Warning: Could not connect to Redis, using in-memory cache")
                 self.redis_client = None
     
+    async def start(self):
+        """Start listening for L1 invalidations from other workers"""
+        if self.pubsub_client and not self.invalidation_task:
+            self.invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+
+    def _redis(self):
+        """The Redis client, or None when there is none or the circuit breaker has cut it off"""
+        if self.redis_client and self.breaker.allow():
+            return self.redis_client
+        return None
+
+    def _redis_failed(self, error: Exception):
+        """Count a failed Redis call towards the circuit breaker
+
+        Only connection errors and timeouts mean Redis is unreachable. With
+        every pooled connection busy the pool raises "Too many connections"
+        without touching Redis, which is load, not an outage; command errors
+        (e.g. WRONGTYPE on a key written in another format) only fail their
+        own call. Either way that call falls back to memory.
+        """
+        if isinstance(error, redis.ConnectionError) and "Too many connections" in str(error):
+            self.pool_exhausted += 1
+        elif isinstance(error, (redis.ConnectionError, redis.TimeoutError, OSError)):
+            self.breaker.record_failure()
+        else:
+            self.command_errors += 1
+
+    async def _probe_redis(self):
+        """Health check used by the circuit breaker to detect that Redis is back"""
+        await self.redis_client.ping()
+
+    def _codec(self, key: str):
+        """Codec for structured values stored under key"""
+        return self.codecs.get(key.split(":", 1)[0], self.default_codec)
+
+    def _value_entry(self, key: str) -> Callable[[Any], Dict[str, Any]]:
+        """Entry builder storing a structured value with its namespace's codec"""
+        codec = self._codec(key)
+        return lambda value: {"value": codec.encode(value)}
+
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache"""
-        # Try Redis first
-        if self.redis_client:
+        value = await self._get_raw(key)
+        return decode_text(value) if value is not None else None
+
+    async def _get_raw(self, key: str) -> Optional[Any]:
+        """Get a value as stored (bytes when read from Redis)"""
+        # Try the in-process L1 first
+        value = self.memory_cache.get(key)
+        if value is not None:
+            return value
+
+        # Then Redis, promoting hits into L1
+        redis_client = self._redis()
+        if redis_client:
             try:
-                value = await self.redis_client.get(key)
-                return value.decode('utf-8') if value else None
-            except Exception:
-                pass
-        
-        # Fallback to memory cache
-        if key in self.memory_cache:
-            # Check if expired
-            import time
-            if key in self.cache_ttl and time.time() > self.cache_ttl[key]:
-                del self.memory_cache[key]
-                del self.cache_ttl[key]
+                value = await redis_client.get(key)
+                self.breaker.record_success()
+            except Exception as e:
+                self._redis_failed(e)
+                return None
+            if value is None:
+                self.l2_misses += 1
                 return None
-            return self.memory_cache[key]
+            self.l2_hits += 1
+            self.memory_cache.set(key, value, self.l1_ttl)
+            return value
         
         return None
     
     async def set(self, key: str, value: str, expire: int = 3600) -> bool:
         """Set value in cache with expiration"""
-        # Try Redis first
-        if self.redis_client:
+        # Write through to Redis first
+        redis_client = self._redis()
+        if redis_client:
             try:
-                await self.redis_client.setex(key, expire, value)
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, expire, value)
+                    self._publish_invalidation(pipe, key)
+                    await pipe.execute()
+                self.breaker.record_success()
+                self.memory_cache.set(key, value, min(expire, self.l1_ttl))
                 return True
-            except Exception:
-                pass
+            except Exception as e:
+                self._redis_failed(e)
         
         # Fallback to memory cache
-        import time
-        self.memory_cache[key] = value
-        self.cache_ttl[key] = time.time() + expire
-        
-        # Clean up expired entries periodically
-        await self._cleanup_memory_cache()
-        
+        self.memory_cache.set(key, value, expire)
+        return True
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Get several values at once: L1 first, then one Redis MGET for the rest"""
+        values = await self._get_many_raw(keys)
+        return {key: decode_text(value) if value is not None else None for key, value in values.items()}
+
+    async def _get_many_raw(self, keys: List[str]) -> Dict[str, Optional[Any]]:
+        """Get several values as stored"""
+        values = self.memory_cache.get_many(keys)
+        missing = [key for key, value in values.items() if value is None]
+
+        redis_client = self._redis() if missing else None
+        if redis_client:
+            try:
+                results = await redis_client.mget(missing)
+                self.breaker.record_success()
+            except Exception as e:
+                self._redis_failed(e)
+                results = [None] * len(missing)
+            for key, value in zip(missing, results):
+                if value is None:
+                    self.l2_misses += 1
+                    continue
+                self.l2_hits += 1
+                values[key] = value
+                self.memory_cache.set(key, value, self.l1_ttl)
+
+        return values
+
+    async def set_many(self, values: Dict[str, str], expire: Union[int, Dict[str, int]] = 3600) -> bool:
+        """Set several values in one round trip, with one TTL for all or one per key"""
+        ttls = {key: expire.get(key, 3600) if isinstance(expire, dict) else expire for key in values}
+
+        # Write through to Redis first
+        redis_client = self._redis()
+        if redis_client:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for key, value in values.items():
+                        pipe.setex(key, ttls[key], value)
+                        self._publish_invalidation(pipe, key)
+                    await pipe.execute()
+                self.breaker.record_success()
+                self.memory_cache.set_many(values, {key: min(ttl, self.l1_ttl) for key, ttl in ttls.items()})
+                return True
+            except Exception as e:
+                self._redis_failed(e)
+
+        # Fallback to memory cache
+        self.memory_cache.set_many(values, ttls)
+        return True
+
+    async def delete_many(self, keys: List[str]) -> bool:
+        """Delete several values (including entries) in one round trip"""
+        redis_client = self._redis() if keys else None
+        if redis_client:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    pipe.delete(*keys)
+                    for key in keys:
+                        self._publish_invalidation(pipe, key)
+                    await pipe.execute()
+                self.breaker.record_success()
+            except Exception as e:
+                self._redis_failed(e)
+
+        self.memory_cache.delete_many(keys)
+        return True
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        """Get a structured value from cache (None if missing or undecodable)"""
+        value = await self._get_raw(key)
+        if value is None:
+            return None
+        try:
+            return decode_value(value)
+        except Exception:
+            return None
+
+    async def set_json(self, key: str, value: Any, expire: int = 3600) -> bool:
+        """Set a structured value in cache, serialized with its namespace's codec"""
+        return await self.set(key, self._codec(key).encode(value), expire=expire)
+
+    async def get_many_json(self, keys: List[str]) -> Dict[str, Optional[Any]]:
+        """Get several structured values at once (None for missing or undecodable ones)"""
+        values = {}
+        for key, value in (await self._get_many_raw(keys)).items():
+            try:
+                values[key] = decode_value(value) if value is not None else None
+            except Exception:
+                values[key] = None
+        return values
+
+    async def set_many_json(self, values: Dict[str, Any], expire: Union[int, Dict[str, int]] = 3600) -> bool:
+        """Set several structured values in one round trip"""
+        return await self.set_many({key: self._codec(key).encode(value) for key, value in values.items()},
+                                   expire=expire)
+    
+    async def get_entry(self, key: str, use_l1: bool = True) -> Optional[Dict[str, Any]]:
+        """Get a cache entry (value plus metadata fields such as fresh_until)
+
+        use_l1=False skips the local copy and reads Redis directly, which
+        single-flight fills use to observe other workers' writes.
+        """
+        # Try the in-process L1 first (the only copy while Redis is cut off)
+        redis_client = self._redis()
+        if use_l1 or not redis_client:
+            entry = self.memory_cache.get(key)
+            if entry is not None:
+                return dict(entry)
+
+        # Then Redis, promoting hits into L1
+        if redis_client:
+            try:
+                raw = await redis_client.hgetall(key)
+                self.breaker.record_success()
+            except Exception as e:
+                self._redis_failed(e)
+                return None
+            return self._promote(key, raw)
+
+        return None
+
+    async def get_entries(self, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get many cache entries at once: L1 first, then one Redis pipeline for the rest"""
+        entries = {key: dict(entry) for key, entry in self.memory_cache.get_many(keys).items() if entry is not None}
+        missing = [key for key in keys if key not in entries]
+
+        redis_client = self._redis() if missing else None
+        if redis_client:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for key in missing:
+                        pipe.hgetall(key)
+                    results = await pipe.execute()
+                self.breaker.record_success()
+            except Exception as e:
+                self._redis_failed(e)
+                results = [None] * len(missing)
+            for key, raw in zip(missing, results):
+                entries[key] = self._promote(key, raw)
+
+        return {key: entries.get(key) for key in keys}
+
+    def _promote(self, key: str, raw: Optional[Dict[bytes, Any]]) -> Optional[Dict[str, Any]]:
+        """Decode an entry read from Redis and copy it into L1"""
+        if not raw:
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        entry = {field.decode('utf-8'): value for field, value in raw.items()}
+        entry["fresh_until"] = float(entry.get("fresh_until", 0))
+        self.memory_cache.set(key, dict(entry), self.l1_ttl)
+        return entry
+
+    async def set_entry(self, key: str, entry: Dict[str, Any], expire: int = 3600) -> bool:
+        """Set a cache entry; expire is the hard TTL after which it is dropped"""
+        # Write through to Redis first
+        redis_client = self._redis()
+        if redis_client:
+            try:
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    pipe.delete(key)
+                    pipe.hset(key, mapping=entry)
+                    pipe.expire(key, expire)
+                    self._publish_invalidation(pipe, key)
+                    await pipe.execute()
+                self.breaker.record_success()
+                self.memory_cache.set(key, dict(entry), min(expire, self.l1_ttl))
+                return True
+            except Exception as e:
+                self._redis_failed(e)
+
+        # Fallback to memory cache
+        self.memory_cache.set(key, dict(entry), expire)
         return True
+
+    async def get_or_set(self, key: str, producer: Callable[[], Awaitable[str]],
+                         expire: int = 3600) -> str:
+        """Get value from cache, computing it once per key on a miss
+
+        After `expire` seconds the entry turns stale: it is still served
+        immediately while a background task refreshes it, until the hard
+        TTL (`expire + stale_ttl`) drops it.
+        """
+        entry = await self.get_or_set_entry(key, producer, expire, _text_entry)
+        return decode_text(entry["value"])
+
+    async def get_or_set_json(self, key: str, producer: Callable[[], Awaitable[Any]],
+                              expire: int = 3600) -> Any:
+        """Get a structured value from cache, computing it once per key on a miss"""
+        entry = await self.get_or_set_entry(key, producer, expire, self._value_entry(key))
+        return decode_value(entry["value"])
+
+    async def get_or_set_entry(self, key: str, producer: Callable[[], Awaitable[Any]],
+                               expire: int = 3600,
+                               build: Callable[[Any], Dict[str, Any]] = _text_entry) -> Dict[str, Any]:
+        """Get a cache entry, computing it once per key on a miss
+
+        `build` turns the produced value into the stored fields ("value"
+        plus any metadata derived from it, such as an ETag), so that work
+        happens once per fill rather than once per request. It may be async.
+        """
+        entry = await self.get_entry(key)
+        if entry is not None:
+            if time.time() < entry["fresh_until"]:
+                return entry
+
+            if not revalidating.get():
+                # Serve stale data now and refresh it in the background
+                if key not in self.inflight:
+                    self._start_fill(key, producer, expire, build, refresh=True)
+                return entry
+
+        # Coalesce concurrent misses: every waiter awaits the same fill task
+        future = self.inflight.get(key)
+        if future is None:
+            future = self._start_fill(key, producer, expire, build)
+
+        # Shield so a disconnecting client does not cancel the shared fill
+        entry = await asyncio.shield(future)
+        if entry is None:
+            # We joined a refresh that deferred to another worker's fill
+            entry = await self._wait_for_fill(key)
+            if entry is None:
+                raise Exception(f"Cache fill for {key} did not complete")
+        return entry
+
+    async def refresh_entry(self, key: str, producer: Callable[[], Awaitable[Any]],
+                            expire: int = 3600,
+                            build: Callable[[Any], Dict[str, Any]] = _text_entry) -> Optional[Dict[str, Any]]:
+        """Recompute an entry now, even if it is still fresh"""
+        future = self.inflight.get(key)
+        if future is not None:
+            # Let the fill already in flight finish first
+            await asyncio.gather(asyncio.shield(future), return_exceptions=True)
+
+        future = self._start_fill(key, producer, expire, build, refresh=True, force=True)
+        return await asyncio.shield(future)
+
+    async def refresh_json(self, key: str, producer: Callable[[], Awaitable[Any]],
+                           expire: int = 3600) -> Any:
+        """Recompute a structured value now, even if it is still fresh"""
+        entry = await self.refresh_entry(key, producer, expire, self._value_entry(key))
+        return decode_value(entry["value"]) if entry else None
+
+    def _start_fill(self, key: str, producer: Callable, expire: int,
+                    build: Callable, refresh: bool = False, force: bool = False) -> asyncio.Future:
+        """Start the single in-process fill task for key"""
+        future = asyncio.ensure_future(self._fill(key, producer, expire, build, refresh, force))
+        self.inflight[key] = future
+        future.add_done_callback(lambda done: self._finish_fill(key, done, refresh))
+        return future
+
+    def _finish_fill(self, key: str, future: asyncio.Future, refresh: bool):
+        """Forget a completed fill task"""
+        if self.inflight.get(key) is future:
+            del self.inflight[key]
+        if future.cancelled():
+            return
+        error = future.exception()  # Mark as retrieved even if every waiter went away
+        if error and refresh and not isinstance(error, RefreshSkipped):
+            print(f"Warning: Background refresh of {key} failed: {error}")
+
+    async def _fill(self, key: str, producer: Callable, expire: int,
+                    build: Callable, refresh: bool, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Compute and store an entry, holding the cross-worker fill lock"""
+        # Nested get_or_set calls made by the producer must not serve stale data
+        revalidating.set(refresh or revalidating.get())
+
+        token = await self._acquire_lock(key)
+        try:
+            if token is None:
+                if refresh:
+                    return None  # Another worker is already refreshing this key
+                # Another worker is filling this key - wait for its result
+                entry = await self._wait_for_fill(key)
+            else:
+                # Re-check in case a fill finished between our miss and the lock
+                entry = await self.get_entry(key, use_l1=False)
+            if entry is not None and time.time() < entry["fresh_until"] and not force:
+                return entry
+
+            value = await producer()
+            fresh_for = expire
+            if isinstance(value, TransientValue):
+                fresh_for = min(expire, value.expire)
+                value = value.value
+
+            entry = build(value)
+            if inspect.isawaitable(entry):
+                entry = await entry
+            entry["fresh_until"] = time.time() + fresh_for
+            if fresh_for < expire:
+                entry["transient"] = 1
+            await self.set_entry(key, entry, expire=expire + self.stale_ttl)
+            return entry
+        finally:
+            if token is not None:
+                await self._release_lock(key, token)
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        """Take the fill lock for key; returns None if another worker holds it"""
+        token = uuid.uuid4().hex
+        redis_client = self._redis()
+        if not redis_client:
+            return token
+
+        try:
+            acquired = await redis_client.set(
+                f"lock:{key}", token, nx=True, px=int(self.lock_timeout * 1000)
+            )
+            self.breaker.record_success()
+            return token if acquired else None
+        except Exception as e:
+            self._redis_failed(e)
+            return token
+
+    async def _release_lock(self, key: str, token: str):
+        """Release the fill lock if we still own it"""
+        redis_client = self._redis()
+        if not redis_client:
+            return
+
+        try:
+            await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token)
+            self.breaker.record_success()
+        except Exception as e:
+            self._redis_failed(e)
+
+    async def _wait_for_fill(self, key: str) -> Optional[Dict[str, Any]]:
+        """Poll for an entry filled by another worker until its lock is released"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.lock_poll_interval)
+            entry = await self.get_entry(key, use_l1=False)
+            if entry is not None and time.time() < entry["fresh_until"]:
+                return entry
+            redis_client = self._redis()
+            if not redis_client:
+                break
+            try:
+                if not await redis_client.exists(f"lock:{key}"):
+                    break
+                self.breaker.record_success()
+            except Exception as e:
+                self._redis_failed(e)
+                break
+        return await self.get_entry(key)
     
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         # Try Redis first
-        if self.redis_client:
+        redis_client = self._redis()
+        if redis_client:
             try:
-                await self.redis_client.delete(key)
-            except Exception:
-                pass
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    pipe.delete(key)
+                    self._publish_invalidation(pipe, key)
+                    await pipe.execute()
+                self.breaker.record_success()
+            except Exception as e:
+                self._redis_failed(e)
         
         # Remove from memory cache
-        if key in self.memory_cache:
-            del self.memory_cache[key]
-        if key in self.cache_ttl:
-            del self.cache_ttl[key]
+        self.memory_cache.delete(key)
         
         return True
     
-    async def _cleanup_memory_cache(self):
-        """Clean up expired entries from memory cache"""
-        import time
-        current_time = time.time()
-        expired_keys = [
-            key for key, expiry in self.cache_ttl.items()
-            if current_time > expiry
-        ]
-        
-        for key in expired_keys:
-            if key in self.memory_cache:
-                del self.memory_cache[key]
-            del self.cache_ttl[key]
+    def _publish_invalidation(self, pipe, key: str):
+        """Queue an L1 invalidation message for other workers on a Redis pipeline"""
+        if self.invalidation_channel:
+            pipe.publish(self.invalidation_channel, f"{self.instance_id}:{key}")
+
+    async def _listen_for_invalidations(self):
+        """Drop L1 copies of keys written or deleted by other workers"""
+        while True:
+            try:
+                pubsub = self.pubsub_client.pubsub()
+                await pubsub.subscribe(self.invalidation_channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    sender, _, key = message["data"].decode('utf-8').partition(":")
+                    if sender != self.instance_id:
+                        self.memory_cache.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Reconnect; L1 entries missed meanwhile still expire after l1_ttl
+                await asyncio.sleep(1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache metrics"""
+        return {
+            "backend": "redis" if self.redis_client and self.breaker.state == "closed" else "memory",
+            "memory": self.memory_cache.stats(),
+            "redis": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "max_connections": self.redis_client.connection_pool.max_connections if self.redis_client else 0,
+                "pool_exhausted": self.pool_exhausted,
+                "command_errors": self.command_errors,
+                "circuit": self.breaker.stats()
+            },
+            "inflight_fills": len(self.inflight)
+        }
     
     def generate_cache_key(self, *args) -> str:
         """Generate a cache key from arguments"""
@@ -105,5 +624,11 @@ class CacheManager:
     
     async def close(self):
         """Close cache connections"""
+        if self.invalidation_task:
+            self.invalidation_task.cancel()
+            self.invalidation_task = None
+        await self.breaker.close()
         if self.redis_client:
             await self.redis_client.close()
+        if self.pubsub_client:
+            await self.pubsub_client.close()
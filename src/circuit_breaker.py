@@ -0,0 +1,84 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+class CircuitBreaker:
+    """Cuts off a failing backend after consecutive errors and probes it to recover
+
+    While closed, calls go through and each failure counts; after
+    `failure_threshold` failures in a row the breaker opens and `allow()`
+    turns callers away immediately, instead of each one waiting for its
+    own timeout. A background task then calls `probe()` every
+    `probe_interval` seconds and closes the breaker once it succeeds.
+    """
+
+    def __init__(self, name: str, probe: Callable[[], Awaitable[Any]],
+                 failure_threshold: int = 5, probe_interval: float = 5.0):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.trips = 0
+        self.short_circuited = 0
+        self.probes_failed = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend"""
+        if self.state == "closed":
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        """Count a failed call, opening the breaker at the threshold"""
+        self.consecutive_failures += 1
+        if self.state == "closed" and self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.time()
+            self.trips += 1
+            print(f"Warning: {self.name} failed {self.consecutive_failures} times in a row, "
+                  f"bypassing it until a probe succeeds")
+            if self.probe_task is None or self.probe_task.done():
+                self.probe_task = asyncio.create_task(self._probe_until_healthy())
+
+    async def _probe_until_healthy(self):
+        """Probe the backend until it answers, then close the breaker"""
+        while self.state == "open":
+            await asyncio.sleep(self.probe_interval)
+            try:
+                await self.probe()
+            except Exception:
+                self.probes_failed += 1
+                continue
+            print(f"{self.name} is reachable again after {time.time() - self.opened_at:.0f}s")
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    async def close(self):
+        """Stop probing"""
+        if self.probe_task:
+            self.probe_task.cancel()
+            await asyncio.gather(self.probe_task, return_exceptions=True)
+            self.probe_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_seconds": round(time.time() - self.opened_at, 1) if self.opened_at else 0.0,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited,
+            "probes_failed": self.probes_failed
+        }
@@ -0,0 +1,46 @@
+import gzip
+from typing import Dict, Iterable, Optional
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Preferred order when a client accepts several encodings equally
+ENCODING_PREFERENCE = ["br", "gzip"]
+
+def compress_variants(data: bytes) -> Dict[str, bytes]:
+    """Pre-compress data once with every supported encoding, at maximum ratio"""
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if BROTLI_AVAILABLE:
+        variants["br"] = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+    return variants
+
+def choose_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """Pick the best available content-coding allowed by an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best = None
+    best_quality = 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding not in available:
+            continue
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
@@ -0,0 +1,69 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+def _digest(value: Any) -> bytes:
+    """Digest of plain data via its repr
+
+    Much cheaper than canonical JSON; equal data built in a different key
+    order only costs a cache miss, never a wrong hit.
+    """
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=16).digest()
+
+class FragmentCache:
+    """Bounded LRU of rendered SVG sections keyed by (section, data digest, theme palette)
+
+    Sections only depend on the slice of repository data they draw and on
+    the palette, so the same fragment is reused across themes that share a
+    palette, across dashboard styles and across re-renders of unchanged
+    data. Renders run in worker threads, hence the lock.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[str, bytes, bytes], str]" = OrderedDict()
+        self.palettes: Dict[int, Tuple[Dict, bytes]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _palette_digest(self, colors: Dict) -> bytes:
+        """Digest of a theme palette (palettes are long-lived, so remember them)"""
+        cached = self.palettes.get(id(colors))
+        if cached is None or cached[0] is not colors:
+            if len(self.palettes) >= 64:
+                self.palettes.clear()
+            cached = (colors, _digest(colors))
+            self.palettes[id(colors)] = cached
+        return cached[1]
+
+    def get_or_render(self, section: str, data: Any, colors: Dict, render: Callable[[], str]) -> str:
+        """Return a cached fragment, rendering and storing it on a miss"""
+        if self.max_entries <= 0:
+            return render()
+
+        key = (section, _digest(data), self._palette_digest(colors))
+        with self.lock:
+            fragment = self.entries.get(key)
+            if fragment is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = render()
+        with self.lock:
+            self.entries[key] = fragment
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return fragment
+
+    def stats(self) -> Dict[str, int]:
+        """Get fragment cache metrics"""
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses
+        }
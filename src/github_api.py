@@ -1,45 +1,309 @@
 import aiohttp
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 import json
+import time
+
+from .cache_manager import CacheManager
+from .repo_stats import RepoStats
+from .stats_warmer import StatsWarmer
+from .token_pool import TokenPool
+
+# Seconds a token rests after a secondary rate limit that names no Retry-After
+SECONDARY_RATE_LIMIT_BACKOFF = 60
+
+# Everything get_repository_stats needs that GraphQL can return in one query
+# (contributors and commit activity are REST-only)
+REPOSITORY_FIELDS_FRAGMENT = """
+fragment RepositoryFields on Repository {
+  name
+  nameWithOwner
+  description
+  stargazerCount
+  forkCount
+  watchers { totalCount }
+  createdAt
+  updatedAt
+  diskUsage
+  openIssues: issues(states: OPEN) { totalCount }
+  closedIssues: issues(states: CLOSED) { totalCount }
+  languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+    edges { size node { name } }
+  }
+}
+"""
 
 class GitHubAPI:
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, pool_limit: int = 100,
+                 pool_limit_per_host: int = 30, keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int = 300, request_timeout: float = 15.0,
+                 cache: Optional[CacheManager] = None, response_cache_ttl: int = 86400,
+                 use_graphql: bool = False, issue_count_source: str = "link",
+                 tokens: Optional[List[str]] = None, low_budget_threshold: float = 0.2,
+                 critical_budget_threshold: float = 0.05):
         self.token = token
         self.base_url = "https://api.github.com"
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "GitHub-Stats-SVG-API"
         }
-        if token:
-            self.headers["Authorization"] = f"token {token}"
+
+        # Requests rotate across every configured token, favouring the one
+        # with the most rate limit budget left
+        pool_tokens = [t for t in [token] + (tokens or []) if t]
+        self.token_pool = TokenPool(list(dict.fromkeys(pool_tokens)))
+
+        # Below these fractions of the remaining budget, background refreshes
+        # of cold repositories (then of every repository) are shed
+        self.low_budget_threshold = low_budget_threshold
+        self.critical_budget_threshold = critical_budget_threshold
+        self.refreshes_shed = 0
+
+        # Connection pool settings for the shared session
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # Upstream responses are kept with their ETag/Last-Modified so
+        # refreshes can be conditional; 304s do not count against the quota
+        self.cache = cache
+        self.response_cache_ttl = response_cache_ttl
+        self.requests_made = 0
+        self.not_modified = 0
+
+        # GraphQL collapses the REST fan-out but requires an authenticated token
+        self.use_graphql = use_graphql and self.token_pool.authenticated
+        self.issue_count_source = issue_count_source
+
+        # Repositories whose /stats endpoints answered 202 are polled in the background
+        self.stats_warmer = StatsWarmer(self._poll_commit_activity)
+
+    async def start(self):
+        """Create the shared, connection-pooled HTTP session and background workers"""
+        await self.stats_warmer.start()
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+        )
+
+    async def close(self):
+        """Close the shared HTTP session and background workers"""
+        await self.stats_warmer.close()
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it lazily if startup was skipped"""
+        if self.session is None or self.session.closed:
+            await self.start()
+        return self.session
+    
+    async def _fetch(self, url: str) -> Tuple[int, Any, str]:
+        """GET a GitHub URL, revalidating any cached copy with a conditional request
+
+        Returns the status, the decoded JSON body and the Link header.
+        """
+        cache_key = f"github_response:{url}"
+        cached = await self.cache.get_json(cache_key) if self.cache else None
+
+        headers = dict(self.headers)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        resource = "search" if "/search/" in url else "core"
+        session = await self._get_session()
+        for _ in range(len(self.token_pool.tokens)):
+            token = self.token_pool.acquire(resource)
+            self.requests_made += 1
+            async with session.get(url, headers=self._authorize(headers, token)) as response:
+                self.token_pool.update(token, response.headers)
+                if response.status == 304 and cached:
+                    # Unchanged upstream: renew our copy without spending rate limit
+                    self.not_modified += 1
+                    await self.cache.set_json(cache_key, cached, expire=self.response_cache_ttl)
+                    return 200, cached["body"], cached.get("link", "")
+
+                try:
+                    body = await response.json(content_type=None)
+                except (aiohttp.ContentTypeError, ValueError):
+                    body = None
+                link = response.headers.get("Link", "")
+
+                if self._is_rate_limited(response, body):
+                    # Retry on the next token with budget left, if any
+                    self.token_pool.mark_exhausted(token, resource, self._reset_time(response))
+                    continue
+
+                if response.status == 200 and self.cache:
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        await self.cache.set_json(cache_key, {
+                            "etag": etag,
+                            "last_modified": last_modified,
+                            "link": link,
+                            "body": body
+                        }, expire=self.response_cache_ttl)
+
+                return response.status, body, link
+
+        # Every token hit its rate limit
+        return response.status, body, link
+
+    def _authorize(self, headers: Dict[str, str], token: Optional[str]) -> Dict[str, str]:
+        """Add the Authorization header for a pool token to request headers"""
+        if not token:
+            return headers
+        return {**headers, "Authorization": f"token {token}"}
+
+    def _is_rate_limited(self, response: aiohttp.ClientResponse, body: Any) -> bool:
+        """Whether a response is a primary or secondary rate limit error"""
+        if response.status == 429:
+            return True
+        if response.status != 403:
+            return False
+        return response.headers.get("X-RateLimit-Remaining") == "0" or "rate limit" in str(body).lower()
+
+    def _reset_time(self, response: aiohttp.ClientResponse) -> float:
+        """When a rate limited token may be used again
+
+        Retry-After if given; X-RateLimit-Reset only when the primary budget
+        is spent (a secondary limit leaves budget, and the primary window may
+        be an hour away); otherwise a short back-off.
+        """
+        try:
+            if "Retry-After" in response.headers:
+                return time.time() + float(response.headers["Retry-After"])
+            if response.headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in response.headers:
+                return float(response.headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+        return time.time() + SECONDARY_RATE_LIMIT_BACKOFF
+
+    def should_shed(self, hot: bool) -> bool:
+        """Whether a background refresh should be skipped to save rate limit budget
+
+        Cold repositories stop being refreshed once the remaining budget drops
+        below the low threshold; hot ones keep refreshing until the critical
+        threshold, leaving what is left for cache misses.
+        """
+        budget = self.token_pool.budget_fraction("core")
+        shed = budget < self.critical_budget_threshold or (budget < self.low_budget_threshold and not hot)
+        if shed:
+            self.refreshes_shed += 1
+        return shed
     
-    async def _make_request(self, url: str, retry_on_202: bool = True) -> Dict:
+    async def _make_request(self, url: str) -> Dict:
         """Make an async HTTP request to GitHub API"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
-                if response.status == 404:
-                    raise Exception("Repository not found")
-                elif response.status == 403:
-                    # Check if it's rate limit or other forbidden error
-                    error_data = await response.json()
-                    if "rate limit" in str(error_data).lower():
-                        raise Exception("API rate limit exceeded. Please add a GitHub token to .env file for higher limits (5000/hour vs 60/hour)")
-                    else:
-                        raise Exception("Access forbidden - repository may be private")
-                elif response.status == 202:
-                    # GitHub is still computing statistics, retry after a short delay
-                    if retry_on_202:
-                        await asyncio.sleep(2)  # Wait 2 seconds
-                        return await self._make_request(url, retry_on_202=False)  # Retry once
-                    else:
-                        # Return empty data if still processing after retry
-                        return {}
-                elif response.status != 200:
-                    raise Exception(f"GitHub API error: {response.status}")
-                return await response.json()
+        status, data, _ = await self._fetch(url)
+        if status == 404:
+            raise Exception("Repository not found")
+        elif status in (403, 429):
+            # Check if it's rate limit or other forbidden error
+            if status == 429 or "rate limit" in str(data).lower():
+                raise Exception("API rate limit exceeded. Please add a GitHub token to .env file for higher limits (5000/hour vs 60/hour)")
+            else:
+                raise Exception("Access forbidden - repository may be private")
+        elif status == 202:
+            # GitHub is still computing statistics; callers decide how to fall back
+            return {}
+        elif status != 200:
+            raise Exception(f"GitHub API error: {status}")
+        return data
     
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict:
+        """Run a GraphQL query, returning its data (partial data is allowed)"""
+        session = await self._get_session()
+        token = self.token_pool.acquire("graphql")
+        self.requests_made += 1
+        async with session.post(f"{self.base_url}/graphql", headers=self._authorize(self.headers, token),
+                                json={"query": query, "variables": variables}) as response:
+            self.token_pool.update(token, response.headers)
+            if self._is_rate_limited(response, None):
+                self.token_pool.mark_exhausted(token, "graphql", self._reset_time(response))
+                raise Exception("GitHub GraphQL API rate limit exceeded")
+            elif response.status == 401:
+                raise Exception("GraphQL API requires a valid GitHub token")
+            elif response.status != 200:
+                raise Exception(f"GitHub GraphQL API error: {response.status}")
+            result = await response.json()
+
+        if not result.get("data"):
+            errors = result.get("errors") or [{"message": "empty response"}]
+            raise Exception(f"GitHub GraphQL API error: {errors[0].get('message')}")
+        return result["data"]
+
+    async def get_repositories_graphql(self, repositories: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """Fetch info, issue/PR counts and languages for several repositories in one aliased query
+
+        Returns one result per input repository, None for repositories that were not found.
+        """
+        if not repositories:
+            return []
+
+        variable_defs = []
+        selections = []
+        variables = {}
+        for i, (owner, repo) in enumerate(repositories):
+            variable_defs.append(f"$owner{i}: String!, $name{i}: String!")
+            selections.append(f"repo{i}: repository(owner: $owner{i}, name: $name{i}) {{ ...RepositoryFields }}")
+            variables[f"owner{i}"] = owner
+            variables[f"name{i}"] = repo
+
+        query = (
+            f"query({', '.join(variable_defs)}) {{\n" + "\n".join(selections) + "\n}\n"
+            + REPOSITORY_FIELDS_FRAGMENT
+        )
+        data = await self._graphql(query, variables)
+        return [data.get(f"repo{i}") for i in range(len(repositories))]
+
+    def _parse_graphql_repository(self, node: Dict) -> Tuple[Dict, Dict, Dict]:
+        """Convert a GraphQL repository node into REST-shaped info, languages and issue stats"""
+        repo_info = {
+            "name": node.get("name"),
+            "full_name": node.get("nameWithOwner"),
+            "description": node.get("description") or "",
+            "stargazers_count": node.get("stargazerCount", 0),
+            "forks_count": node.get("forkCount", 0),
+            "watchers_count": (node.get("watchers") or {}).get("totalCount", 0),
+            "created_at": node.get("createdAt", ""),
+            "updated_at": node.get("updatedAt", ""),
+            "size": node.get("diskUsage") or 0
+        }
+
+        languages = {
+            edge["node"]["name"]: edge["size"]
+            for edge in (node.get("languages") or {}).get("edges", [])
+        }
+
+        open_issues = (node.get("openIssues") or {}).get("totalCount", 0)
+        closed_issues = (node.get("closedIssues") or {}).get("totalCount", 0)
+        issues_stats = {
+            "open_issues": open_issues,
+            "closed_issues": closed_issues,
+            "total_issues": open_issues + closed_issues
+        }
+
+        return repo_info, languages, issues_stats
+
     async def get_repository_info(self, owner: str, repo: str) -> Dict:
         """Get basic repository information"""
         url = f"{self.base_url}/repos/{owner}/{repo}"
@@ -52,13 +316,32 @@ class GitHubAPI:
     
     async def get_commit_activity(self, owner: str, repo: str) -> List[Dict]:
         """Get weekly commit activity for the past year"""
+        commit_activity, _ = await self._get_commit_activity(owner, repo)
+        return commit_activity
+
+    async def _get_commit_activity(self, owner: str, repo: str) -> Tuple[List[Dict], bool]:
+        """Get weekly commit activity and whether GitHub is still computing it
+
+        On 202 the last known good activity (or an empty list) is returned
+        immediately and the repository is queued for background polling.
+        """
         url = f"{self.base_url}/repos/{owner}/{repo}/stats/commit_activity"
         result = await self._make_request(url)
-        # Handle case where GitHub returns empty data (still processing)
-        if not result or not isinstance(result, list):
-            # Return default activity data
-            return [{"total": 5 + (i % 10), "week": f"2024-{i:02d}"} for i in range(1, 13)]
-        return result
+        if isinstance(result, list):
+            return result, False
+
+        # Still processing: fall back to the last good response, if any
+        self.stats_warmer.enqueue(owner, repo)
+        cached = await self.cache.get_json(f"github_response:{url}") if self.cache else None
+        if cached and isinstance(cached.get("body"), list):
+            return cached["body"], True
+        return [], True
+
+    async def _poll_commit_activity(self, owner: str, repo: str) -> bool:
+        """Check whether commit activity statistics are ready (stores them when they are)"""
+        url = f"{self.base_url}/repos/{owner}/{repo}/stats/commit_activity"
+        status, data, _ = await self._fetch(url)
+        return status == 200 and isinstance(data, list)
     
     async def get_languages(self, owner: str, repo: str) -> Dict:
         """Get programming languages used in the repository"""
@@ -66,57 +349,51 @@ class GitHubAPI:
         return await self._make_request(url)
     
     async def get_issues_stats(self, owner: str, repo: str) -> Dict:
-        """Get issues and pull requests statistics"""
-        # Get open issues (excluding PRs)
-        open_issues_url = f"{self.base_url}/repos/{owner}/{repo}/issues?state=open&per_page=1"
-        # Get closed issues (excluding PRs)
-        closed_issues_url = f"{self.base_url}/repos/{owner}/{repo}/issues?state=closed&per_page=1"
-        # Get open PRs
-        open_prs_url = f"{self.base_url}/repos/{owner}/{repo}/pulls?state=open&per_page=1"
-        # Get closed PRs
-        closed_prs_url = f"{self.base_url}/repos/{owner}/{repo}/pulls?state=closed&per_page=1"
-
-        async with aiohttp.ClientSession() as session:
-            # Get open issues count
-            async with session.get(open_issues_url, headers=self.headers) as response:
-                if response.status == 200:
-                    link_header = response.headers.get('Link', '')
-                    open_issues_count = self._extract_count_from_link_header(link_header)
-                else:
-                    open_issues_count = 0
-
-            # Get closed issues count
-            async with session.get(closed_issues_url, headers=self.headers) as response:
-                if response.status == 200:
-                    link_header = response.headers.get('Link', '')
-                    closed_issues_count = self._extract_count_from_link_header(link_header)
-                else:
-                    closed_issues_count = 0
-
-            # Get open PRs count
-            async with session.get(open_prs_url, headers=self.headers) as response:
-                if response.status == 200:
-                    link_header = response.headers.get('Link', '')
-                    open_prs_count = self._extract_count_from_link_header(link_header)
-                else:
-                    open_prs_count = 0
-
-            # Get closed PRs count
-            async with session.get(closed_prs_url, headers=self.headers) as response:
-                if response.status == 200:
-                    link_header = response.headers.get('Link', '')
-                    closed_prs_count = self._extract_count_from_link_header(link_header)
-                else:
-                    closed_prs_count = 0
+        """Get open and closed issue counts
+
+        Both counts are requested concurrently. With the "search" count
+        source they come from the Search API's total_count, which counts
+        issues without pull requests but has a lower rate limit (30/min);
+        the default "link" source reads the last page from the Link header.
+        Pull request counts are not fetched: no dashboard draws them.
+        """
+        if self.issue_count_source == "search":
+            qualifier = f"repo:{owner}/{repo}"
+            counts = await asyncio.gather(
+                self._count_from_search(f"{qualifier} type:issue state:open"),
+                self._count_from_search(f"{qualifier} type:issue state:closed")
+            )
+        else:
+            counts = await asyncio.gather(
+                # Open and closed issues (GitHub includes PRs in these)
+                self._count_from_link(f"{self.base_url}/repos/{owner}/{repo}/issues?state=open&per_page=1"),
+                self._count_from_link(f"{self.base_url}/repos/{owner}/{repo}/issues?state=closed&per_page=1")
+            )
+        open_issues_count, closed_issues_count = counts
 
         return {
             "open_issues": open_issues_count,
             "closed_issues": closed_issues_count,
-            "total_issues": open_issues_count + closed_issues_count,
-            "open_prs": open_prs_count,
-            "closed_prs": closed_prs_count,
-            "total_prs": open_prs_count + closed_prs_count
+            "total_issues": open_issues_count + closed_issues_count
         }
+
+    async def _count_from_link(self, url: str) -> int:
+        """Count items of a per_page=1 listing from its Link header"""
+        status, data, link_header = await self._fetch(url)
+        if status != 200:
+            return 0
+        if not link_header:
+            # Single page: the body holds zero or one item
+            return len(data) if isinstance(data, list) else 0
+        return self._extract_count_from_link_header(link_header)
+
+    async def _count_from_search(self, query: str) -> int:
+        """Count issues or pull requests matching a search query"""
+        url = f"{self.base_url}/search/issues?q={quote(query)}&per_page=1"
+        status, data, _ = await self._fetch(url)
+        if status == 200 and isinstance(data, dict):
+            return int(data.get("total_count", 0))
+        return 0
     
     def _extract_count_from_link_header(self, link_header: str) -> int:
         """Extract total count from GitHub's Link header"""
@@ -130,13 +407,16 @@ class GitHubAPI:
             return int(match.group(1))
         return 1  # If no pagination, there's at least 1 page
     
-    async def get_repository_stats(self, owner: str, repo: str) -> Dict:
+    async def get_repository_stats(self, owner: str, repo: str) -> RepoStats:
         """Get comprehensive repository statistics"""
+        if self.use_graphql:
+            return (await self.get_repositories_stats([(owner, repo)]))[0]
+
         # Fetch all data concurrently
         tasks = [
             self.get_repository_info(owner, repo),
             self.get_contributors(owner, repo),
-            self.get_commit_activity(owner, repo),
+            self._get_commit_activity(owner, repo),
             self.get_languages(owner, repo),
             self.get_issues_stats(owner, repo)
         ]
@@ -147,62 +427,68 @@ class GitHubAPI:
             # Handle individual failures gracefully
             repo_info = results[0] if not isinstance(results[0], Exception) else {}
             contributors = results[1] if not isinstance(results[1], Exception) else []
-            commit_activity = results[2] if not isinstance(results[2], Exception) else []
+            commit_activity, stats_pending = results[2] if not isinstance(results[2], Exception) else ([], False)
             languages = results[3] if not isinstance(results[3], Exception) else {}
             issues_stats = results[4] if not isinstance(results[4], Exception) else {}
 
         except Exception as e:
             raise Exception(f"Failed to fetch repository data: {str(e)}")
-        
-        # Process and combine the data with null checks
-        total_commits = 0
-        if commit_activity and isinstance(commit_activity, list):
-            total_commits = sum(week.get('total', 0) for week in commit_activity if week and isinstance(week, dict))
-
-        # Get top contributors (limit to top 5)
-        top_contributors = []
-        if contributors and isinstance(contributors, list):
-            top_contributors = contributors[:5]
-
-        # Calculate language percentages
-        language_percentages = {}
-        if languages and isinstance(languages, dict):
-            total_bytes = sum(languages.values())
-            if total_bytes > 0:
-                language_percentages = {
-                    lang: (bytes_count / total_bytes) * 100
-                    for lang, bytes_count in languages.items()
-                    if bytes_count and isinstance(bytes_count, (int, float))
-                }
-        
-        return {
-            "repository": {
-                "name": repo_info.get("name", repo) if repo_info else repo,
-                "full_name": repo_info.get("full_name", f"{owner}/{repo}") if repo_info else f"{owner}/{repo}",
-                "description": repo_info.get("description", "") if repo_info else "",
-                "stars": repo_info.get("stargazers_count", 0) if repo_info else 0,
-                "forks": repo_info.get("forks_count", 0) if repo_info else 0,
-                "watchers": repo_info.get("watchers_count", 0) if repo_info else 0,
-                "created_at": repo_info.get("created_at", "") if repo_info else "",
-                "updated_at": repo_info.get("updated_at", "") if repo_info else "",
-                "size": repo_info.get("size", 0) if repo_info else 0
-            },
-            "statistics": {
-                "total_commits": total_commits,
-                "total_contributors": len(top_contributors),
-                "open_issues": issues_stats.get("open_issues", 0) if issues_stats else 0,
-                "closed_issues": issues_stats.get("closed_issues", 0) if issues_stats else 0,
-                "total_issues": issues_stats.get("total_issues", 0) if issues_stats else 0,
-                "open_prs": issues_stats.get("open_prs", 0) if issues_stats else 0,
-                "closed_prs": issues_stats.get("closed_prs", 0) if issues_stats else 0,
-                "total_prs": issues_stats.get("total_prs", 0) if issues_stats else 0
-            },
-            "contributors": top_contributors,
-            "commit_activity": commit_activity if commit_activity else [],
-            "languages": language_percentages,
-            "generated_at": datetime.now().isoformat()
-        }
-    
+
+        return self._combine_repository_stats(owner, repo, repo_info, contributors,
+                                              commit_activity, languages, issues_stats,
+                                              stats_pending)
+
+    async def get_repositories_stats(self, repositories: List[Tuple[str, str]]) -> List[RepoStats]:
+        """Get comprehensive statistics for several repositories
+
+        With GraphQL enabled, info, counts and languages for all repositories
+        come from a single query, alongside the REST-only contributors and
+        commit activity requests.
+        """
+        if not self.use_graphql:
+            return await asyncio.gather(*(self.get_repository_stats(owner, repo)
+                                          for owner, repo in repositories))
+
+        rest_tasks = []
+        for owner, repo in repositories:
+            rest_tasks.append(self.get_contributors(owner, repo))
+            rest_tasks.append(self._get_commit_activity(owner, repo))
+
+        try:
+            nodes, *rest_results = await asyncio.gather(
+                self.get_repositories_graphql(repositories), *rest_tasks, return_exceptions=True
+            )
+        except Exception as e:
+            raise Exception(f"Failed to fetch repository data: {str(e)}")
+        if isinstance(nodes, Exception):
+            raise Exception(f"Failed to fetch repository data: {str(nodes)}")
+
+        results = []
+        for i, (owner, repo) in enumerate(repositories):
+            # A missing repository degrades to empty data, as on the REST path
+            if nodes[i] is not None:
+                repo_info, languages, issues_stats = self._parse_graphql_repository(nodes[i])
+            else:
+                repo_info, languages, issues_stats = {}, {}, {}
+
+            # Handle individual failures gracefully
+            contributors = rest_results[2 * i] if not isinstance(rest_results[2 * i], Exception) else []
+            commit_activity, stats_pending = (rest_results[2 * i + 1]
+                                              if not isinstance(rest_results[2 * i + 1], Exception)
+                                              else ([], False))
+
+            results.append(self._combine_repository_stats(owner, repo, repo_info, contributors,
+                                                          commit_activity, languages, issues_stats,
+                                                          stats_pending))
+        return results
+
+    def _combine_repository_stats(self, owner: str, repo: str, repo_info: Dict, contributors: List,
+                                  commit_activity: List, languages: Dict, issues_stats: Dict,
+                                  stats_pending: bool = False) -> RepoStats:
+        """Combine fetched data into the repository statistics the dashboards draw"""
+        return RepoStats.from_github(repo, repo_info, contributors, commit_activity, languages,
+                                     issues_stats, stats_pending)
+
     async def get_contributor_stats(self, owner: str, repo: str, username: str) -> Dict:
         """Get statistics for a specific contributor"""
         # Get contributor's commits
@@ -233,3 +519,12 @@ class GitHubAPI:
             "repository": f"{owner}/{repo}",
             "generated_at": datetime.now().isoformat()
         }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get upstream request metrics"""
+        return {
+            "requests": self.requests_made,
+            "not_modified": self.not_modified,
+            "rate_limit": {**self.token_pool.stats(), "refreshes_shed": self.refreshes_shed},
+            "stats_warming": self.stats_warmer.stats()
+        }
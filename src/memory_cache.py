@@ -0,0 +1,170 @@
+import heapq
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+class MemoryCache:
+    """Byte-size bounded in-memory LRU cache with per-entry expiration
+
+    Lookups and writes are O(1) via an OrderedDict kept in recency order;
+    expirations are tracked in a min-heap so purging expired entries never
+    scans the whole cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entries: int = 0):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries  # 0 means bounded by size only
+        self.entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.current_bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value and mark it as most recently used"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if time.time() > expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, expire: int = 3600) -> bool:
+        """Set value with expiration, evicting least recently used entries if over budget"""
+        size = _sizeof(key) + _sizeof(value)
+        if size > self.max_bytes:
+            # Never let a single oversized value flush the whole cache
+            self.rejections += 1
+            self.delete(key)
+            return False
+
+        if key in self.entries:
+            self._remove(key)
+
+        expires_at = time.time() + expire
+        self.entries[key] = (value, expires_at, size)
+        self.current_bytes += size
+        heapq.heappush(self.expiry_heap, (expires_at, key))
+
+        self._purge_expired()
+        self._evict()
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Delete value; its heap record is discarded lazily"""
+        if key not in self.entries:
+            return False
+        self._remove(key)
+        return True
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """Get several values at once (None for missing or expired keys)"""
+        return {key: self.get(key) for key in keys}
+
+    def set_many(self, values: Dict[str, Any], expire: Union[int, Dict[str, int]] = 3600) -> int:
+        """Set several values, with one TTL for all or one per key; returns how many were stored
+
+        Expired entries are purged and the budget enforced once for the
+        whole batch rather than after every value.
+        """
+        stored = 0
+        now = time.time()
+        for key, value in values.items():
+            size = _sizeof(key) + _sizeof(value)
+            if size > self.max_bytes:
+                self.rejections += 1
+                self.delete(key)
+                continue
+
+            if key in self.entries:
+                self._remove(key)
+            expires_at = now + (expire.get(key, 3600) if isinstance(expire, dict) else expire)
+            self.entries[key] = (value, expires_at, size)
+            self.current_bytes += size
+            heapq.heappush(self.expiry_heap, (expires_at, key))
+            stored += 1
+
+        self._purge_expired()
+        self._evict()
+        return stored
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several values; returns how many existed"""
+        return sum(self.delete(key) for key in keys)
+
+    def clear(self):
+        """Remove every entry"""
+        self.entries.clear()
+        self.expiry_heap.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/eviction counters"""
+        return {
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejections": self.rejections
+        }
+
+    def _remove(self, key: str):
+        """Drop an entry and release its bytes"""
+        _, _, size = self.entries.pop(key)
+        self.current_bytes -= size
+
+    def _purge_expired(self):
+        """Pop expired entries off the heap, skipping stale heap records"""
+        now = time.time()
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            # The key may have been rewritten or deleted since this record was pushed
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key)
+                self.expirations += 1
+
+        # Rebuild the heap if overwritten keys left too many stale records behind
+        if len(heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [(entry[1], key) for key, entry in self.entries.items()]
+            heapq.heapify(self.expiry_heap)
+
+    def _evict(self):
+        """Evict least recently used entries until within budget"""
+        while self.entries and (
+            self.current_bytes > self.max_bytes
+            or (self.max_entries and len(self.entries) > self.max_entries)
+        ):
+            key = next(iter(self.entries))
+            self._remove(key)
+            self.evictions += 1
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory footprint of a cached value"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    return sys.getsizeof(value)
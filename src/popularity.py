@@ -0,0 +1,59 @@
+import math
+import time
+from typing import Dict, List, Tuple
+
+class PopularityTracker:
+    """Exponentially decaying hit counts per key
+
+    A hit is worth 1 when recorded and half as much after `half_life`
+    seconds, so scores reflect recent traffic rather than all-time totals.
+    """
+
+    def __init__(self, half_life: float = 3600.0, hot_score: float = 5.0, max_keys: int = 10000):
+        self.half_life = half_life
+        self.hot_score = hot_score
+        self.max_keys = max_keys
+        self.scores: Dict[str, Tuple[float, float]] = {}  # key -> (score, updated_at)
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * math.pow(0.5, (now - updated_at) / self.half_life)
+
+    def record(self, key: str):
+        """Count a hit for key"""
+        now = time.time()
+        score, updated_at = self.scores.get(key, (0.0, now))
+        self.scores[key] = (self._decayed(score, updated_at, now) + 1.0, now)
+        if len(self.scores) > self.max_keys:
+            self._prune(now)
+
+    def score(self, key: str) -> float:
+        """Current decayed hit count for key"""
+        if key not in self.scores:
+            return 0.0
+        score, updated_at = self.scores[key]
+        return self._decayed(score, updated_at, time.time())
+
+    def is_hot(self, key: str) -> bool:
+        """Whether key has seen enough recent traffic to be prioritised"""
+        return self.score(key) >= self.hot_score
+
+    def top(self, limit: int) -> List[Tuple[str, float]]:
+        """The most popular keys with their scores, highest first"""
+        now = time.time()
+        ranked = sorted(
+            ((key, self._decayed(score, updated_at, now)) for key, (score, updated_at) in self.scores.items()),
+            key=lambda item: item[1], reverse=True
+        )
+        return ranked[:limit]
+
+    def _prune(self, now: float):
+        """Forget the least popular half of the keys"""
+        keep = self.top(self.max_keys // 2)
+        self.scores = {key: (score, now) for key, score in keep}
+
+    def stats(self) -> dict:
+        """Get popularity tracking metrics"""
+        return {
+            "tracked": len(self.scores),
+            "hot": sum(1 for key in self.scores if self.is_hot(key))
+        }
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from .cache_manager import RefreshSkipped
+from .popularity import PopularityTracker
+
+def parse_watchlist(lines: Iterable[str]) -> List[Tuple[str, str]]:
+    """Parse "owner/repo" entries, ignoring blanks, comments and duplicates"""
+    repositories = {}
+    for line in lines:
+        entry = line.split("#", 1)[0].strip()
+        owner, _, repo = entry.partition("/")
+        if owner and repo and "/" not in repo:
+            repositories[(owner, repo)] = None
+    return list(repositories)
+
+class PreWarmer:
+    """Background scheduler that refreshes repositories before their cache entries expire
+
+    Every `interval` seconds each watched repository is passed to
+    `warm(owner, repo)`, which returns False if there was nothing to do.
+    Calls are spread evenly over the interval to smooth GitHub API usage,
+    and made in order of popularity so the most viewed repositories are
+    refreshed first. The `popular_limit` most viewed repositories are
+    warmed too, even if they are not on the watchlist.
+
+    With a `batch_size` above 1, repositories are instead passed
+    `batch_size` at a time to `warm_many(repositories)`, one batch per time
+    slot, so their data can be fetched together. It returns one result per
+    repository: what `warm` would have returned, or the exception it raised.
+    """
+
+    def __init__(self, warm: Callable[[str, str], Awaitable[bool]],
+                 watchlist: List[Tuple[str, str]], popularity: PopularityTracker,
+                 interval: float = 3000.0, popular_limit: int = 0,
+                 warm_many: Optional[Callable[[List[Tuple[str, str]]], Awaitable[List[Any]]]] = None,
+                 batch_size: int = 1):
+        self.warm = warm
+        self.watchlist = watchlist
+        self.popularity = popularity
+        self.interval = interval
+        self.popular_limit = popular_limit
+        self.warm_many = warm_many
+        self.batch_size = batch_size if warm_many else 1
+
+        self.task: Optional[asyncio.Task] = None
+        self.cycles = 0
+        self.warmed = 0
+        self.fresh = 0
+        self.shed = 0
+        self.failed = 0
+        self.last_cycle_busy_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.watchlist) or self.popular_limit > 0
+
+    def repositories(self) -> List[Tuple[str, str]]:
+        """Repositories to warm this cycle, most popular first"""
+        repositories = set(self.watchlist)
+        if self.popular_limit > 0:
+            for key, _ in self.popularity.top(self.popular_limit):
+                owner, _, repo = key.partition("/")
+                repositories.add((owner, repo))
+        return sorted(repositories, key=lambda item: (-self.popularity.score("/".join(item)), item))
+
+    async def start(self):
+        """Start the scheduler task"""
+        if self.enabled and self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop the scheduler task"""
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def stats(self) -> dict:
+        """Get pre-warming metrics"""
+        return {
+            "watchlist": len(self.watchlist),
+            "cycles": self.cycles,
+            "warmed": self.warmed,
+            "fresh": self.fresh,
+            "shed": self.shed,
+            "failed": self.failed,
+            "last_cycle_busy_seconds": round(self.last_cycle_busy_seconds, 1)
+        }
+
+    async def _run(self):
+        """Warm the repositories cycle after cycle"""
+        while True:
+            await self._cycle()
+
+    async def _cycle(self):
+        """Warm every repository once, one batch per time slot"""
+        repositories = self.repositories()
+        if not repositories:
+            await asyncio.sleep(self.interval)
+            return
+
+        batches = [repositories[i:i + self.batch_size] for i in range(0, len(repositories), self.batch_size)]
+        slot = self.interval / len(batches)
+        started = time.monotonic()
+        busy = 0.0
+        for i, batch in enumerate(batches):
+            warm_started = time.monotonic()
+            try:
+                if len(batch) > 1:
+                    results = await self.warm_many(batch)
+                else:
+                    results = [await self.warm(*batch[0])]
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results = [e] * len(batch)
+            for (owner, repo), result in zip(batch, results):
+                self._record(owner, repo, result)
+            busy += time.monotonic() - warm_started
+
+            # Wait for the next slot (immediately if warming fell behind)
+            delay = started + (i + 1) * slot - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        self.cycles += 1
+        self.last_cycle_busy_seconds = busy
+
+    def _record(self, owner: str, repo: str, result: Any):
+        """Count the outcome of warming one repository"""
+        if isinstance(result, RefreshSkipped):
+            self.shed += 1
+        elif isinstance(result, Exception):
+            self.failed += 1
+            print(f"Warning: Pre-warming {owner}/{repo} failed: {result}")
+        elif result:
+            self.warmed += 1
+        else:
+            self.fresh += 1
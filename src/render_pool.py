@@ -0,0 +1,185 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+class RenderQueueFull(Exception):
+    """Raised when the render queue stays full for longer than the queue timeout"""
+
+def _timed(func: Callable, args: tuple, kwargs: dict) -> Tuple[Any, float]:
+    """Run func in a worker and measure how long it took there"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+def _join(func: Callable[..., Iterator[str]], args: tuple, kwargs: dict) -> str:
+    """Render a chunked render path in one go (process workers cannot stream back)"""
+    return "".join(func(*args, **kwargs))
+
+def _next_batch(chunks: Iterator[str], batch_size: int) -> Tuple[Optional[str], float]:
+    """Pull chunks until about batch_size characters are ready; None once exhausted"""
+    started = time.perf_counter()
+    batch: List[str] = []
+    size = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        size += len(chunk)
+        if size >= batch_size:
+            break
+    return ("".join(batch) if batch else None), time.perf_counter() - started
+
+class RenderPool:
+    """Runs CPU-bound SVG rendering off the event loop
+
+    Renders go to a thread or process pool ("inline" runs them on the loop
+    as before). At most `workers + max_queue` renders are admitted at once;
+    further callers wait up to `queue_timeout` seconds for a place and then
+    get RenderQueueFull, so overload turns into fast rejections instead of
+    an unbounded backlog.
+    """
+
+    def __init__(self, executor: str = "thread", workers: int = 4, max_queue: int = 64,
+                 queue_timeout: float = 5.0):
+        if executor not in ("thread", "process", "inline"):
+            raise Exception(f"Unknown render executor: {executor}")
+        self.executor_type = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.executor: Optional[Executor] = None
+        self.slots = asyncio.Semaphore(workers + max_queue)
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.render_seconds = 0.0
+        self.max_render_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        """Return the worker pool, creating it on first use"""
+        if self.executor is None:
+            if self.executor_type == "process":
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render")
+        return self.executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Admitted renders waiting for a free worker"""
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Render func(*args, **kwargs) in the pool, waiting for a queue slot if needed"""
+        if self.executor_type == "inline":
+            # Runs to completion before any other render can start, so there is nothing to queue
+            result, seconds = _timed(func, args, kwargs)
+            self._record(seconds)
+            return result
+
+        await self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            result, seconds = await loop.run_in_executor(self._get_executor(), _timed, func, args, kwargs)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._release()
+
+        self._record(seconds)
+        return result
+
+    async def stream(self, func: Callable[..., Iterator[str]], *args,
+                     batch_size: int = 8192, **kwargs) -> AsyncIterator[str]:
+        """Render a chunked render path, yielding batches of about batch_size characters
+
+        The generator advances in a worker thread one batch at a time, so
+        the first bytes are ready long before the whole SVG is. A render
+        holds its queue slot until the last batch. Process workers cannot
+        hand back a live generator and render it in one batch instead.
+        """
+        if self.executor_type == "process":
+            yield await self.run(_join, func, args, kwargs)
+            return
+
+        chunks = func(*args, **kwargs)  # Nothing runs until the first batch is pulled
+        if self.executor_type == "inline":
+            seconds = 0.0
+            while True:
+                batch, batch_seconds = _next_batch(chunks, batch_size)
+                seconds += batch_seconds
+                if batch is None:
+                    break
+                yield batch
+                await asyncio.sleep(0)  # Let the server flush the batch
+            self._record(seconds)
+            return
+
+        await self._admit()
+        seconds = 0.0
+        try:
+            loop = asyncio.get_running_loop()
+            while True:
+                batch, batch_seconds = await loop.run_in_executor(
+                    self._get_executor(), _next_batch, chunks, batch_size
+                )
+                seconds += batch_seconds
+                if batch is None:
+                    break
+                yield batch
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._release()
+        self._record(seconds)
+
+    async def _admit(self):
+        """Take a render slot, waiting up to queue_timeout when all are taken"""
+        if self.slots.locked():
+            try:
+                await asyncio.wait_for(self.slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise RenderQueueFull(f"Render queue full ({self.in_flight} renders in flight)")
+        else:
+            await self.slots.acquire()
+
+        self.in_flight += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def _release(self):
+        """Give back a render slot"""
+        self.in_flight -= 1
+        self.slots.release()
+
+    def _record(self, seconds: float):
+        """Count a completed render and its duration"""
+        self.completed += 1
+        self.render_seconds += seconds
+        self.max_render_seconds = max(self.max_render_seconds, seconds)
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get render queue and timing metrics"""
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "render_ms_avg": round(self.render_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "render_ms_max": round(self.max_render_seconds * 1000, 2)
+        }
@@ -0,0 +1,95 @@
+from array import array
+from typing import Any, Dict, List, NamedTuple
+
+# Contributors kept per repository (the dashboards draw the top 5)
+TOP_CONTRIBUTORS = 5
+
+class ContributorSummary(NamedTuple):
+    """The part of a GitHub contributor object the dashboards draw"""
+    login: str
+    contributions: int
+
+class RepoStats(NamedTuple):
+    """Repository statistics as rendered by SVGGenerator
+
+    Only the fields the dashboards draw are kept: contributors are reduced
+    to login and contribution count, and commit activity to one unsigned
+    int per week, instead of the raw GitHub objects with their URLs, node
+    ids and per-day arrays.
+    """
+    name: str
+    description: str
+    stars: int
+    forks: int
+    open_issues: int
+    closed_issues: int
+    total_issues: int
+    total_commits: int
+    languages: Dict[str, float]
+    contributors: List[ContributorSummary]
+    weekly_commits: array
+    # True while GitHub is still computing commit activity
+    stats_pending: bool = False
+
+    @classmethod
+    def from_github(cls, repo: str, repo_info: Dict, contributors: List, commit_activity: List,
+                    languages: Dict, issues_stats: Dict, stats_pending: bool = False) -> "RepoStats":
+        """Build from GitHub API responses, tolerating missing or malformed parts"""
+        repo_info = repo_info or {}
+        issues_stats = issues_stats or {}
+
+        weekly_commits = array("I")
+        if commit_activity and isinstance(commit_activity, list):
+            weekly_commits.extend(
+                max(int(week.get("total", 0) or 0), 0) for week in commit_activity if week and isinstance(week, dict)
+            )
+
+        # Calculate language percentages
+        language_percentages = {}
+        if languages and isinstance(languages, dict):
+            total_bytes = sum(languages.values())
+            if total_bytes > 0:
+                language_percentages = {
+                    lang: (bytes_count / total_bytes) * 100
+                    for lang, bytes_count in languages.items()
+                    if bytes_count and isinstance(bytes_count, (int, float))
+                }
+
+        top_contributors = []
+        if contributors and isinstance(contributors, list):
+            top_contributors = [
+                ContributorSummary(c.get("login", "Unknown"), c.get("contributions", 0))
+                for c in contributors[:TOP_CONTRIBUTORS] if isinstance(c, dict)
+            ]
+
+        return cls(
+            name=repo_info.get("name", repo),
+            description=repo_info.get("description") or "",
+            stars=repo_info.get("stargazers_count", 0),
+            forks=repo_info.get("forks_count", 0),
+            open_issues=issues_stats.get("open_issues", 0),
+            closed_issues=issues_stats.get("closed_issues", 0),
+            total_issues=issues_stats.get("total_issues", 0),
+            total_commits=sum(weekly_commits),
+            languages=language_percentages,
+            contributors=top_contributors,
+            weekly_commits=weekly_commits,
+            stats_pending=stats_pending
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain data for the cache (contributors as [login, contributions] pairs)"""
+        return {
+            **self._asdict(),
+            "contributors": [list(contributor) for contributor in self.contributors],
+            "weekly_commits": self.weekly_commits.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RepoStats":
+        """Rebuild from to_dict() output"""
+        return cls(**{
+            **data,
+            "contributors": [ContributorSummary(*contributor) for contributor in data["contributors"]],
+            "weekly_commits": array("I", data["weekly_commits"])
+        })
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+class StatsWarmer:
+    """Background queue that polls GitHub until "202 computing" statistics are ready
+
+    GitHub answers /stats/* endpoints with 202 while it computes them. Rather
+    than sleeping inside the request path, repositories are queued here and
+    polled with exponential backoff; `on_done(owner, repo, ready)` is called
+    once the statistics are available or polling gives up.
+    """
+
+    def __init__(self, poll: Callable[[str, str], Awaitable[bool]],
+                 on_done: Optional[Callable[[str, str, bool], Awaitable[None]]] = None,
+                 workers: int = 2, initial_delay: float = 2.0, max_delay: float = 60.0,
+                 max_attempts: int = 8):
+        self.poll = poll
+        self.on_done = on_done
+        self.workers = workers
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+
+        self.queue: "asyncio.Queue[Tuple[str, str]]" = asyncio.Queue()
+        self.pending: Set[Tuple[str, str]] = set()
+        self.tasks: List[asyncio.Task] = []
+        self.completed = 0
+        self.abandoned = 0
+
+    def enqueue(self, owner: str, repo: str):
+        """Queue a repository whose statistics are still being computed"""
+        if (owner, repo) in self.pending:
+            return
+        self.pending.add((owner, repo))
+        self.queue.put_nowait((owner, repo))
+
+    async def start(self):
+        """Start the polling workers"""
+        if self.tasks:
+            return
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        """Stop the polling workers"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def stats(self) -> dict:
+        """Get warming queue metrics"""
+        return {
+            "pending": len(self.pending),
+            "completed": self.completed,
+            "abandoned": self.abandoned
+        }
+
+    async def _worker(self):
+        """Take repositories off the queue and warm them one at a time"""
+        while True:
+            owner, repo = await self.queue.get()
+            try:
+                await self._warm(owner, repo)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Statistics warming for {owner}/{repo} failed: {e}")
+            finally:
+                self.pending.discard((owner, repo))
+                self.queue.task_done()
+
+    async def _warm(self, owner: str, repo: str):
+        """Poll with exponential backoff until the statistics are ready"""
+        delay = self.initial_delay
+        ready = False
+        for _ in range(self.max_attempts):
+            await asyncio.sleep(delay)
+            if await self.poll(owner, repo):
+                ready = True
+                break
+            delay = min(delay * 2, self.max_delay)
+
+        if ready:
+            self.completed += 1
+        else:
+            self.abandoned += 1
+
+        # No longer pending once on_done runs, so nothing registers for a callback already made
+        self.pending.discard((owner, repo))
+        if self.on_done:
+            await self.on_done(owner, repo, ready)
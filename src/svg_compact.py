@@ -0,0 +1,228 @@
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+
+# Namespaced attributes ElementTree reports as "{uri}name", written back with their prefix
+ATTRIBUTE_NAMESPACES = {
+    "http://www.w3.org/XML/1998/namespace": "xml",
+    "http://www.w3.org/1999/xlink": "xlink"
+}
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# Elements whose text is rendered, and those of them laid out inline within a <text>
+TEXT_ELEMENTS = ("text", "tspan", "textPath")
+INLINE_TEXT_ELEMENTS = ("tspan", "textPath")
+
+# Presentation attributes that move into CSS classes, with their CSS spelling
+CSS_PROPERTIES = {
+    "font-family": "font-family",
+    "font-size": "font-size",
+    "font-weight": "font-weight",
+    "text-anchor": "text-anchor",
+    "fill": "fill",
+    "stroke": "stroke",
+    "stroke-width": "stroke-width",
+    "opacity": "opacity"
+}
+
+# Attributes whose numbers are rounded, and to how many decimals
+ROUNDED_ATTRIBUTES = {
+    "x": 1, "y": 1, "x1": 1, "y1": 1, "x2": 1, "y2": 1, "cx": 1, "cy": 1, "r": 1,
+    "width": 1, "height": 1, "rx": 1, "points": 1, "transform": 1,
+    "stroke-dasharray": 1, "stroke-dashoffset": 1, "opacity": 2
+}
+
+# Repeated shapes drawn from one shared definition when they occur this often
+MIN_REUSE = 3
+
+# Attribute sets hoisted into a CSS class when this many elements share them
+MIN_CLASS_USES = 3
+
+NUMBER_PATTERN = re.compile(r"-?\d+\.\d+")
+
+# "&" not starting an entity or character reference (user text is not escaped upstream)
+BARE_AMPERSAND = re.compile(r"&(?!#?\w+;)")
+
+def _round_numbers(value: str, decimals: int) -> str:
+    """Round every decimal number in an attribute value, dropping trailing zeros"""
+    def shorten(match):
+        text = f"{float(match.group()):.{decimals}f}".rstrip("0").rstrip(".")
+        return "0" if text in ("-0", "") else text
+    return NUMBER_PATTERN.sub(shorten, value)
+
+def _class_name(index: int) -> str:
+    """Short identifier for the index-th class or shared shape: a, b, ..., z, a0, ..."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    name = letters[index % 26]
+    index //= 26
+    while index:
+        name += "0123456789abcdefghijklmnopqrstuvwxyz"[index % 36]
+        index //= 36
+    return name
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _text(value: str) -> str:
+    """Text content as SVG renders it by default: whitespace runs collapsed, ends trimmed"""
+    return escape(" ".join(value.split()))
+
+def compact_svg(svg: str) -> str:
+    """Rewrite an SVG into its compact form (returns it unchanged if it is not valid XML)
+
+    Coordinates are rounded, whitespace and comments dropped, rects that
+    only differ in position become <use> references to one shared
+    definition, and presentation attributes repeated across elements are
+    hoisted into a <style> block of short CSS classes.
+    """
+    try:
+        root = ET.fromstring(BARE_AMPERSAND.sub("&amp;", svg))
+    except ET.ParseError:
+        return svg
+
+    # Attributes in namespaces we cannot write back would come out malformed
+    namespaces = {name[1:].split("}", 1)[0] for element in root.iter() for name in element.attrib if name[0] == "{"}
+    if not namespaces <= set(ATTRIBUTE_NAMESPACES):
+        return svg
+
+    elements = [element for element in root.iter() if element is not root]
+    for element in root.iter():
+        for name, decimals in ROUNDED_ATTRIBUTES.items():
+            if name in element.attrib:
+                element.attrib[name] = _round_numbers(element.attrib[name], decimals)
+
+    # Rects repeated with the same size and styling become <use> of one definition
+    shape_counts = Counter(
+        _shape_signature(element) for element in elements if _local(element.tag) == "rect"
+    )
+    shapes: Dict[Tuple, str] = {}
+    for signature, count in shape_counts.most_common():
+        if count >= MIN_REUSE:
+            shapes[signature] = _class_name(len(shapes))
+
+    # Presentation attribute sets shared by several elements become classes
+    style_counts = Counter()
+    for element in elements:
+        if _local(element.tag) != "rect" or _shape_signature(element) not in shapes:
+            style = _style_signature(element)
+            if style:
+                style_counts[style] += 1
+    classes: Dict[Tuple, str] = {}
+    for style, count in style_counts.most_common():
+        if count >= MIN_CLASS_USES:
+            classes[style] = _class_name(len(classes))
+
+    declarations = "".join(
+        f' xmlns:{ATTRIBUTE_NAMESPACES[uri]}="{uri}"' for uri in sorted(namespaces) if ATTRIBUTE_NAMESPACES[uri] != "xml"
+    )
+    parts: List[str] = [f'<svg xmlns="{SVG_NAMESPACE}"{declarations}{_attributes(root.attrib)}>']
+    if classes:
+        rules = "".join(
+            "." + name + "{" + ";".join(f"{CSS_PROPERTIES[attr]}:{_css_value(attr, value)}" for attr, value in style) + "}"
+            for style, name in classes.items()
+        )
+        parts.append(f"<style>{rules}</style>")
+    if shapes:
+        parts.append("<defs>")
+        for signature, name in shapes.items():
+            parts.append(f'<rect id="{name}"{_attributes(dict(signature))}/>')
+        parts.append("</defs>")
+    _serialize_content(root, parts, shapes, classes, root.get(XML_SPACE) == "preserve")
+    parts.append("</svg>")
+    return "".join(parts)
+
+def _shape_signature(element: ET.Element) -> Tuple:
+    """Everything about a rect except its position"""
+    return tuple(sorted((name, value) for name, value in element.attrib.items() if name not in ("x", "y")))
+
+def _style_signature(element: ET.Element) -> Tuple:
+    """The element's hoistable presentation attributes"""
+    return tuple(sorted((name, value) for name, value in element.attrib.items() if name in CSS_PROPERTIES))
+
+def _css_value(name: str, value: str) -> str:
+    """Presentation attribute value in CSS syntax (unitless lengths need px)"""
+    if name in ("font-size", "stroke-width") and re.fullmatch(r"-?\d+(\.\d+)?", value):
+        return value + "px"
+    return value
+
+def _attribute_name(name: str) -> str:
+    """Attribute name as written in markup ("{uri}space" -> "xml:space")"""
+    if name[0] == "{":
+        uri, local = name[1:].split("}", 1)
+        return f"{ATTRIBUTE_NAMESPACES[uri]}:{local}"
+    return name
+
+def _attributes(attributes: Dict[str, str]) -> str:
+    return "".join(f" {_attribute_name(name)}={quoteattr(value)}" for name, value in attributes.items())
+
+def _serialize(element: ET.Element, parts: List[str], shapes: Dict[Tuple, str], classes: Dict[Tuple, str],
+               preserve: bool = False, in_text: bool = False):
+    """Append an element and its children without pretty-print whitespace"""
+    tag = _local(element.tag)
+    attributes = dict(element.attrib)
+
+    if tag == "rect" and len(element) == 0:
+        shape = shapes.get(_shape_signature(element))
+        if shape:
+            position = {name: attributes[name] for name in ("x", "y") if name in attributes}
+            parts.append(f'<use href="#{shape}"{_attributes(position)}/>')
+            return
+
+    style = _style_signature(element)
+    if style in classes:
+        for name, _ in style:
+            del attributes[name]
+        attributes["class"] = classes[style]
+
+    # xml:space="preserve" keeps the text exactly as written, for this element and below
+    space = element.get(XML_SPACE)
+    if space is not None:
+        preserve = space == "preserve"
+
+    content: List[str] = []
+    _serialize_content(element, content, shapes, classes, preserve, in_text)
+    if not any(content):
+        parts.append(f"<{tag}{_attributes(attributes)}/>")
+    else:
+        parts.append(f"<{tag}{_attributes(attributes)}>")
+        parts.extend(content)
+        parts.append(f"</{tag}>")
+
+def _serialize_content(element: ET.Element, parts: List[str], shapes: Dict[Tuple, str], classes: Dict[Tuple, str],
+                       preserve: bool, in_text: bool = False):
+    """Append an element's text and children, with the text between them
+
+    Inside text content, whitespace next to a child element separates words
+    (`Total Commits: <tspan>`), so it is collapsed but only trimmed at the
+    edges of the whole <text>.
+    """
+    tag = _local(element.tag)
+    in_text = in_text or tag in TEXT_ELEMENTS
+    inline = tag in INLINE_TEXT_ELEMENTS
+    children = list(element)
+
+    parts.append(_content(element.text, preserve, in_text, trim_start=not inline, trim_end=not inline and not children))
+    for index, child in enumerate(children):
+        _serialize(child, parts, shapes, classes, preserve, in_text)
+        last = index == len(children) - 1
+        parts.append(_content(child.tail, preserve, in_text, trim_start=False, trim_end=not inline and last))
+
+def _content(value: str, preserve: bool, in_text: bool, trim_start: bool, trim_end: bool) -> str:
+    """A text node, verbatim under xml:space="preserve" and otherwise with whitespace runs collapsed"""
+    if not value:
+        return ""
+    if preserve:
+        return escape(value)
+    if not in_text:
+        # Outside text content, whitespace-only nodes are pretty-printing
+        return _text(value) if value.strip() else ""
+    words = " ".join(value.split())
+    if not words:
+        return "" if trim_start or trim_end else " "
+    start = " " if value[0].isspace() and not trim_start else ""
+    end = " " if value[-1].isspace() and not trim_end else ""
+    return escape(start + words + end)
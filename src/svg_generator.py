@@ -1,9 +1,42 @@
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 import math
+import re
 from datetime import datetime
+from xml.sax.saxutils import escape
+
+from .fragment_cache import FragmentCache
+from .repo_stats import ContributorSummary, RepoStats
+from .svg_template import SVGTemplate, slot
+
+# Animated text rendering strategies (see iter_animated_text)
+ANIMATED_TEXT_MODES = ("chars", "reveal")
+
+SVG_ROOT_PATTERN = re.compile(r"<svg\b[^>]*>")
+SVG_SIZE_PATTERN = re.compile(r'\b(width|height)="([\d.]+)"')
+# id definitions and #id references, namespaced per badge inside a sprite
+SVG_ID_PATTERN = re.compile(r'(\bid="|url\(#|href="#)([^")]+)')
+# Class names too, since a <style> block applies to the whole sprite (compact badges reuse .a, .b, ...)
+SVG_STYLE_PATTERN = re.compile(r"(<style\b[^>]*>)(.*?)(</style>)", re.S)
+SVG_CLASS_PATTERN = re.compile(r'\bclass="([^"]*)"')
+CSS_RULE_PATTERN = re.compile(r"([^{}]*)(\{[^}]*\})")
+CSS_CLASS_SELECTOR_PATTERN = re.compile(r"\.(-?[_A-Za-z][\w-]*)")
+
+def _prefix_classes(svg: str, prefix: str) -> str:
+    """Prefix every class name in an SVG's <style> selectors and class attributes"""
+    def rule(match):
+        selector = CSS_CLASS_SELECTOR_PATTERN.sub(lambda name: f".{prefix}{name.group(1)}", match.group(1))
+        return selector + match.group(2)
+
+    def style(match):
+        return match.group(1) + CSS_RULE_PATTERN.sub(rule, match.group(2)) + match.group(3)
+
+    svg = SVG_STYLE_PATTERN.sub(style, svg)
+    return SVG_CLASS_PATTERN.sub(
+        lambda match: 'class="' + " ".join(prefix + name for name in match.group(1).split()) + '"', svg
+    )
 
 class SVGGenerator:
-    def __init__(self):
+    def __init__(self, fragment_cache_size: int = 1024):
         self.themes = {
             "default": {
                 "background": "#ffffff",
@@ -44,11 +77,60 @@ class SVGGenerator:
                 "indigo": "#6366f1"
             }
         }
+
+        # Dashboards rendered from precompiled templates:
+        # style -> (layout, slot values from data, typed slots)
+        self.dashboards: Dict[str, Tuple[Callable, Callable, Dict[str, Callable[[Any], str]]]] = {
+            "repo_stats": (self._repo_stats_layout, self._repo_stats_values, {
+                "name": str,
+                "description": str,
+                "stars": self._format_number,
+                "forks": self._format_number,
+                "issues": self._format_number,
+                "commits": self._format_number,
+                "languages": str,
+                "contributors": str,
+                "generated_at": str
+            }),
+            "repobeats": (self._repobeats_layout, self._repobeats_values, {
+                "total_commits": str,
+                "issue_ratio": "{:.2f}".format,
+                "pr_opened": str,
+                "commits": str,
+                **{f"contributor_{i}": str for i in range(5)}
+            }),
+            "modern": (self._modern_layout, self._modern_values, {
+                "push_count": str,
+                "commit_count": str,
+                "push_dash": str,
+                "commit_dash": str
+            })
+        }
+        self.templates: Dict[Tuple[str, str], SVGTemplate] = {}
+
+        # Data-dependent sections, reused across themes, styles and re-renders
+        self.fragments = FragmentCache(max_entries=fragment_cache_size)
+
+    def __reduce__(self):
+        # Process pool workers keep one generator (and its compiled templates)
+        # instead of unpickling a fresh copy for every render
+        return (shared_generator, ())
     
     def get_theme_colors(self, theme: str) -> Dict[str, str]:
         """Get color scheme for the specified theme"""
         return self.themes.get(theme, self.themes["default"])
 
+    def stats(self) -> Dict[str, Any]:
+        """Get template and fragment cache metrics"""
+        return {
+            "templates": len(self.templates),
+            "fragments": self.fragments.stats()
+        }
+
+    def _fragment(self, section: str, render: Callable[..., str], args: tuple, colors: Dict) -> str:
+        """Render a section through the fragment cache; args must be all the data it draws"""
+        return self.fragments.get_or_render(section, args, colors, lambda: render(*args, colors))
+
     def _safe_truncate_text(self, text, max_length: int) -> str:
         """Safely truncate text with null handling"""
         if not text or text is None:
@@ -58,16 +140,57 @@ class SVGGenerator:
             return text_str[:max_length] + "..."
         return text_str
     
-    def generate_repo_stats_svg(self, data: Dict, theme: str = "default") -> str:
-        """Generate SVG for repository statistics"""
+    def _get_template(self, style: str, theme: str) -> SVGTemplate:
+        """Get a dashboard's template for a theme, compiling it on first use"""
+        key = (style, theme if theme in self.themes else "default")
+        template = self.templates.get(key)
+        if template is None:
+            layout, _, slots = self.dashboards[style]
+            source = layout(self.get_theme_colors(theme), {name: slot(name) for name in slots})
+            template = self.templates[key] = SVGTemplate(source, slots)
+        return template
+
+    def _render_dashboard(self, style: str, data: RepoStats, theme: str) -> str:
+        """Render a dashboard by filling its precompiled template"""
+        _, values, _ = self.dashboards[style]
+        return self._get_template(style, theme).render(values(data, self.get_theme_colors(theme)))
+
+    def iter_dashboard(self, style: str, data: RepoStats, theme: str = "default") -> Iterator[str]:
+        """Yield a dashboard chunk by chunk (same output as its generate_* method)"""
+        _, values, _ = self.dashboards[style]
+        return self._get_template(style, theme).iter_render(values(data, self.get_theme_colors(theme)))
+
+    def render_uncompiled(self, style: str, data: RepoStats, theme: str = "default") -> str:
+        """Render a dashboard by building all of its markup (reference for benchmarks)"""
+        layout, values, slots = self.dashboards[style]
         colors = self.get_theme_colors(theme)
+        slot_values = values(data, colors)
+        return layout(colors, {name: format_value(slot_values[name]) for name, format_value in slots.items()})
 
-        # Safe data extraction with defaults
-        repo = data.get("repository", {})
-        stats = data.get("statistics", {})
-        languages = data.get("languages", {})
-        contributors = data.get("contributors", [])
-        
+    def generate_repo_stats_svg(self, data: RepoStats, theme: str = "default") -> str:
+        """Generate SVG for repository statistics"""
+        return self._render_dashboard("repo_stats", data, theme)
+
+    def _repo_stats_values(self, data: RepoStats, colors: Dict) -> Dict[str, Any]:
+        """Slot values of the repository statistics card"""
+        return {
+            "name": data.name or "Repository",
+            "description": self._safe_truncate_text(data.description, 80),
+            "stars": data.stars,
+            "forks": data.forks,
+            "issues": data.open_issues,
+            "commits": data.total_commits,
+            "languages": self._fragment(
+                "languages", self._generate_language_chart, (20, 160, 350, data.languages), colors
+            ),
+            "contributors": self._fragment(
+                "contributors", self._generate_contributors_section, (400, 160, data.contributors), colors
+            ),
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M UTC")
+        }
+
+    def _repo_stats_layout(self, colors: Dict, values: Dict[str, str]) -> str:
+        """Markup of the repository statistics card around its formatted slot values"""
         # SVG dimensions
         width = 800
         height = 400
@@ -77,36 +200,36 @@ class SVGGenerator:
             f'<rect width="{width}" height="{height}" fill="{colors["background"]}" rx="6"/>',
             
             # Title
-            f'<text x="20" y="30" font-family="Arial, sans-serif" font-size="18" font-weight="bold" fill="{colors["text_primary"]}">{repo.get("name", "Repository")}</text>',
-            f'<text x="20" y="50" font-family="Arial, sans-serif" font-size="12" fill="{colors["text_secondary"]}">{self._safe_truncate_text(repo.get("description"), 80)}</text>',
+            f'<text x="20" y="30" font-family="Arial, sans-serif" font-size="18" font-weight="bold" fill="{colors["text_primary"]}">{values["name"]}</text>',
+            f'<text x="20" y="50" font-family="Arial, sans-serif" font-size="12" fill="{colors["text_secondary"]}">{values["description"]}</text>',
             
             # Stats boxes
-            self._generate_stat_box(80, 80, "Stars", repo.get("stars", 0), colors["accent"], colors),
-            self._generate_stat_box(200, 80, "Forks", repo.get("forks", 0), colors["success"], colors),
-            self._generate_stat_box(320, 80, "Issues", stats.get("open_issues", 0), colors["warning"], colors),
-            self._generate_stat_box(440, 80, "Commits", stats.get("total_commits", 0), colors["accent"], colors),
+            self._generate_stat_box(80, 80, "Stars", values["stars"], colors["accent"], colors),
+            self._generate_stat_box(200, 80, "Forks", values["forks"], colors["success"], colors),
+            self._generate_stat_box(320, 80, "Issues", values["issues"], colors["warning"], colors),
+            self._generate_stat_box(440, 80, "Commits", values["commits"], colors["accent"], colors),
             
             # Language chart
-            self._generate_language_chart(20, 160, 350, languages, colors),
+            values["languages"],
             
             # Contributors section
-            self._generate_contributors_section(400, 160, contributors, colors),
+            values["contributors"],
             
             # Footer
-            f'<text x="20" y="{height-10}" font-family="Arial, sans-serif" font-size="10" fill="{colors["text_secondary"]}">Generated at {datetime.now().strftime("%Y-%m-%d %H:%M UTC")}</text>',
+            f'<text x="20" y="{height-10}" font-family="Arial, sans-serif" font-size="10" fill="{colors["text_secondary"]}">Generated at {values["generated_at"]}</text>',
             
             '</svg>'
         ]
         
         return '\n'.join(svg_parts)
     
-    def _generate_stat_box(self, x: int, y: int, label: str, value: int, color: str, colors: Dict) -> str:
-        """Generate a statistics box"""
+    def _generate_stat_box(self, x: int, y: int, label: str, value: str, color: str, colors: Dict) -> str:
+        """Generate a statistics box around an already formatted value"""
         return f'''
         <g>
             <rect x="{x}" y="{y}" width="100" height="60" fill="{colors["background"]}" stroke="{colors["border"]}" rx="4"/>
             <text x="{x+50}" y="{y+20}" font-family="Arial, sans-serif" font-size="12" text-anchor="middle" fill="{colors["text_secondary"]}">{label}</text>
-            <text x="{x+50}" y="{y+40}" font-family="Arial, sans-serif" font-size="16" font-weight="bold" text-anchor="middle" fill="{color}">{self._format_number(value)}</text>
+            <text x="{x+50}" y="{y+40}" font-family="Arial, sans-serif" font-size="16" font-weight="bold" text-anchor="middle" fill="{color}">{value}</text>
         </g>'''
     
     def _format_number(self, num: int) -> str:
@@ -159,7 +282,8 @@ class SVGGenerator:
         
         return '\n'.join(chart_parts)
     
-    def _generate_contributors_section(self, x: int, y: int, contributors: List, colors: Dict) -> str:
+    def _generate_contributors_section(self, x: int, y: int, contributors: List[ContributorSummary],
+                                       colors: Dict) -> str:
         """Generate contributors section"""
         if not contributors:
             return f'<text x="{x}" y="{y+20}" font-family="Arial, sans-serif" font-size="12" fill="{colors["text_secondary"]}">No contributors data</text>'
@@ -173,8 +297,8 @@ class SVGGenerator:
             # Contributor avatar (placeholder circle)
             section_parts.extend([
                 f'<circle cx="{x + avatar_size//2}" cy="{contrib_y + avatar_size//2}" r="{avatar_size//2}" fill="{colors["accent"]}" opacity="0.3"/>',
-                f'<text x="{x + avatar_size + 10}" y="{contrib_y + 8}" font-family="Arial, sans-serif" font-size="11" fill="{colors["text_primary"]}">{contributor.get("login", "Unknown")}</text>',
-                f'<text x="{x + avatar_size + 10}" y="{contrib_y + 20}" font-family="Arial, sans-serif" font-size="10" fill="{colors["text_secondary"]}">{contributor.get("contributions", 0)} contributions</text>'
+                f'<text x="{x + avatar_size + 10}" y="{contrib_y + 8}" font-family="Arial, sans-serif" font-size="11" fill="{colors["text_primary"]}">{contributor.login}</text>',
+                f'<text x="{x + avatar_size + 10}" y="{contrib_y + 20}" font-family="Arial, sans-serif" font-size="10" fill="{colors["text_secondary"]}">{contributor.contributions} contributions</text>'
             ])
         
         return '\n'.join(section_parts)
@@ -202,7 +326,7 @@ class SVGGenerator:
             f'<text x="20" y="80" font-family="Arial, sans-serif" font-size="14" fill="{colors["text_primary"]}">Total Commits: <tspan font-weight="bold" fill="{colors["accent"]}">{total_commits}</tspan></text>',
             
             # Activity heatmap (simplified)
-            self._generate_activity_heatmap(20, 100, 560, activity, colors),
+            self._fragment("activity_heatmap", self._generate_activity_heatmap, (20, 100, 560, activity), colors),
             
             # Footer
             f'<text x="20" y="{height-10}" font-family="Arial, sans-serif" font-size="10" fill="{colors["text_secondary"]}">Generated at {datetime.now().strftime("%Y-%m-%d %H:%M UTC")}</text>',
@@ -243,10 +367,10 @@ class SVGGenerator:
 
         return '\n'.join(heatmap_parts)
 
-    def generate_commit_activity_svg(self, data: Dict, theme: str = "default") -> str:
+    def generate_commit_activity_svg(self, data: RepoStats, theme: str = "default") -> str:
         """Generate SVG for commit activity over time"""
         colors = self.get_theme_colors(theme)
-        commit_activity = data.get("commit_activity", [])
+        commit_activity = data.weekly_commits
 
         if not commit_activity:
             return self._generate_empty_chart("No commit activity data", theme)
@@ -273,12 +397,12 @@ class SVGGenerator:
         ]
 
         # Generate line chart
-        max_commits = max(week.get('total', 0) for week in commit_activity) if commit_activity else 1
+        max_commits = max(commit_activity) if commit_activity else 1
         points = []
 
-        for i, week in enumerate(commit_activity):
+        for i, total in enumerate(commit_activity):
             x_pos = chart_x + (i / len(commit_activity)) * chart_width
-            y_pos = chart_y + chart_height - (week.get('total', 0) / max_commits) * chart_height
+            y_pos = chart_y + chart_height - (total / max_commits) * chart_height
             points.append(f"{x_pos},{y_pos}")
 
         if points:
@@ -308,15 +432,40 @@ class SVGGenerator:
             <text x="{width//2}" y="{height//2}" font-family="Arial, sans-serif" font-size="14" text-anchor="middle" fill="{colors["text_secondary"]}">{message}</text>
         </svg>'''
 
-    def generate_repobeats_style_svg(self, data: Dict, theme: str = "default") -> str:
+    def generate_repobeats_style_svg(self, data: RepoStats, theme: str = "default") -> str:
         """Generate exact RepoBeats-style comprehensive dashboard SVG"""
-        colors = self.get_theme_colors(theme)
+        return self._render_dashboard("repobeats", data, theme)
+
+    def _repobeats_values(self, data: RepoStats, colors: Dict) -> Dict[str, Any]:
+        """Slot values of the RepoBeats-style dashboard"""
+        # Calculate realistic metrics
+        total_issues = data.total_issues
+        open_issues = data.open_issues
+        issue_ratio = open_issues / max(total_issues, 1) if total_issues > 0 else 0.68
 
-        # Safe data extraction with defaults
-        repo = data.get("repository", {})
-        stats = data.get("statistics", {})
-        contributors = data.get("contributors", [])
+        # Default contributor names if no data
+        default_contributors = ["tommoor", "hmacr", "HalfVoxel", "outline-trans", "TimeToCodeSom"]
+
+        contributors = data.contributors
+        if contributors and len(contributors) > 0:
+            contributor_names = [c.login for c in contributors[:5]]
+        else:
+            contributor_names = default_contributors
 
+        # Ensure we have exactly 5 contributors
+        while len(contributor_names) < 5:
+            contributor_names.append(f"contributor{len(contributor_names)+1}")
+
+        return {
+            "total_commits": data.total_commits,
+            "issue_ratio": issue_ratio,
+            "pr_opened": min(data.open_issues, 100),
+            "commits": min(data.total_commits, 200),
+            **{f"contributor_{i}": name for i, name in enumerate(contributor_names[:5])}
+        }
+
+    def _repobeats_layout(self, colors: Dict, values: Dict[str, str]) -> str:
+        """Markup of the RepoBeats-style dashboard around its formatted slot values"""
         # SVG dimensions matching RepoBeats
         width = 900
         height = 400
@@ -327,26 +476,27 @@ class SVGGenerator:
             f'<rect width="{width}" height="{height}" fill="{colors["background"]}" stroke="#e1e4e8" stroke-width="1" rx="6"/>',
 
             # Header with contributions summary
-            self._generate_repobeats_header(15, 15, width-30, data, colors),
+            self._generate_repobeats_header(15, 15, width-30, values["total_commits"], colors),
 
             # Main metrics row (3 cards)
-            self._generate_repobeats_metrics(15, 70, width-30, data, colors),
+            self._generate_repobeats_metrics(15, 70, width-30, values, colors),
 
             # Charts section (3 charts side by side)
-            self._generate_repobeats_charts(15, 160, width-30, 180, data, colors),
+            self._generate_repobeats_charts(15, 160, width-30, 180, colors),
 
             # Contributors section with GitHub-style heatmaps
-            self._generate_repobeats_contributors(15, 350, width-30, contributors, colors),
+            self._generate_repobeats_contributors(
+                15, 350, width-30, [values[f"contributor_{i}"] for i in range(5)], colors
+            ),
 
             '</svg>'
         ]
 
         return '\n'.join(svg_parts)
 
-    def _generate_contributions_header(self, x: int, y: int, width: int, data: Dict, colors: Dict) -> str:
+    def _generate_contributions_header(self, x: int, y: int, width: int, data: RepoStats, colors: Dict) -> str:
         """Generate the contributions summary header"""
-        stats = data["statistics"]
-        total_commits = stats.get("total_commits", 0)
+        total_commits = data.total_commits
 
         # Generate activity dots (simplified representation)
         dots = []
@@ -364,17 +514,14 @@ class SVGGenerator:
             {''.join(dots)}
         </g>'''
 
-    def _generate_metrics_row(self, x: int, y: int, width: int, data: Dict, colors: Dict) -> str:
+    def _generate_metrics_row(self, x: int, y: int, width: int, data: RepoStats, colors: Dict) -> str:
         """Generate the main metrics row with colorful indicators"""
-        repo = data["repository"]
-        stats = data["statistics"]
-
         # Calculate metrics
-        total_issues = stats.get("total_issues", 1)
-        open_issues = stats.get("open_issues", 0)
+        total_issues = data.total_issues
+        open_issues = data.open_issues
         issue_ratio = open_issues / max(total_issues, 1)
-        pr_opened = min(stats.get("open_issues", 0), 100)  # Simplified - would need separate PR data
-        commits = stats.get("total_commits", 0)
+        pr_opened = min(data.open_issues, 100)  # Simplified - would need separate PR data
+        commits = data.total_commits
 
         metric_width = width // 3
 
@@ -402,7 +549,8 @@ class SVGGenerator:
             </g>
         </g>'''
 
-    def _generate_charts_section(self, x: int, y: int, width: int, height: int, data: Dict, colors: Dict) -> str:
+    def _generate_charts_section(self, x: int, y: int, width: int, height: int, data: RepoStats,
+                                 colors: Dict) -> str:
         """Generate the colorful charts section"""
         chart_width = width // 3 - 20
         chart_height = height - 40
@@ -441,17 +589,15 @@ class SVGGenerator:
         return '\n'.join(charts)
 
     def _generate_bar_chart(self, x: int, y: int, width: int, height: int, title: str,
-                           labels: List[str], chart_colors: List[str], data: Dict, colors: Dict) -> str:
+                           labels: List[str], chart_colors: List[str], data: RepoStats, colors: Dict) -> str:
         """Generate a colorful bar chart"""
-        stats = data["statistics"]
-
         # Sample data - in real implementation, this would come from actual data
         if "Issues" in title:
-            values = [stats.get("open_issues", 0), stats.get("closed_issues", 0)]
+            values = [data.open_issues, data.closed_issues]
         elif "Pull" in title:
-            values = [stats.get("open_issues", 0) // 2, stats.get("closed_issues", 0) // 2]  # Simplified
+            values = [data.open_issues // 2, data.closed_issues // 2]  # Simplified
         else:
-            values = [stats.get("total_commits", 0) // 4, stats.get("total_commits", 0)]  # Simplified
+            values = [data.total_commits // 4, data.total_commits]  # Simplified
 
         max_value = max(values) if values else 1
 
@@ -487,7 +633,8 @@ class SVGGenerator:
 
         return '\n'.join(chart_parts)
 
-    def _generate_contributors_heatmap(self, x: int, y: int, width: int, contributors: List, colors: Dict) -> str:
+    def _generate_contributors_heatmap(self, x: int, y: int, width: int, contributors: List[ContributorSummary],
+                                       colors: Dict) -> str:
         """Generate contributors section with GitHub-style heatmaps"""
         if not contributors:
             return f'<text x="{x}" y="{y+15}" font-family="Arial, sans-serif" font-size="12" fill="{colors["text_secondary"]}">No contributors data</text>'
@@ -505,8 +652,8 @@ class SVGGenerator:
             contrib_x = x + i * contributor_width
             contrib_y = y + 20
 
-            username = contributor.get("login", f"User{i+1}")
-            contributions = contributor.get("contributions", 0)
+            username = contributor.login
+            contributions = contributor.contributions
 
             # Contributor name
             heatmap_parts.append(
@@ -531,11 +678,8 @@ class SVGGenerator:
 
         return '\n'.join(heatmap_parts)
 
-    def _generate_repobeats_header(self, x: int, y: int, width: int, data: Dict, colors: Dict) -> str:
+    def _generate_repobeats_header(self, x: int, y: int, width: int, total_commits: str, colors: Dict) -> str:
         """Generate exact RepoBeats-style header with contribution dots"""
-        stats = data["statistics"]
-        total_commits = stats.get("total_commits", 240)  # Default for demo
-
         # Pink/magenta color for contributions
         contrib_color = "#ff69b4" if colors["background"] == "#ffffff" else "#ff69b4"
 
@@ -567,18 +711,11 @@ class SVGGenerator:
             {''.join(dots)}
         </g>'''
 
-    def _generate_repobeats_metrics(self, x: int, y: int, width: int, data: Dict, colors: Dict) -> str:
+    def _generate_repobeats_metrics(self, x: int, y: int, width: int, values: Dict[str, str], colors: Dict) -> str:
         """Generate exact RepoBeats-style metrics cards"""
-        stats = data["statistics"]
-
-        # Calculate realistic metrics
-        total_issues = stats.get("total_issues", 100)
-        open_issues = stats.get("open_issues", 50)
-        closed_issues = total_issues - open_issues
-        issue_ratio = open_issues / max(total_issues, 1) if total_issues > 0 else 0.68
-
-        pr_opened = min(stats.get("open_issues", 46), 100)
-        commits = min(stats.get("total_commits", 64), 200)
+        issue_ratio = values["issue_ratio"]
+        pr_opened = values["pr_opened"]
+        commits = values["commits"]
 
         card_width = (width - 40) // 3
 
@@ -586,7 +723,7 @@ class SVGGenerator:
         <g>
             <!-- Issue Ratio Card -->
             <rect x="{x}" y="{y}" width="{card_width}" height="70" fill="{colors["background"]}" stroke="#e1e4e8" rx="6"/>
-            <text x="{x+15}" y="{y+20}" font-family="-apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif" font-size="16" font-weight="600" fill="#0969da">{issue_ratio:.2f} Opened/Closed Issue Ratio</text>
+            <text x="{x+15}" y="{y+20}" font-family="-apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif" font-size="16" font-weight="600" fill="#0969da">{issue_ratio} Opened/Closed Issue Ratio</text>
             <text x="{x+15}" y="{y+40}" font-family="-apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif" font-size="14" fill="#656d76">0 (-0.27%)</text>
             <text x="{x+15}" y="{y+55}" font-family="-apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif" font-size="12" fill="#cf222e">v past month</text>
 
@@ -603,7 +740,7 @@ class SVGGenerator:
             <text x="{x + (card_width + 20) * 2 + 15}" y="{y+55}" font-family="-apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif" font-size="12" fill="#cf222e">v past month</text>
         </g>'''
 
-    def _generate_repobeats_charts(self, x: int, y: int, width: int, height: int, data: Dict, colors: Dict) -> str:
+    def _generate_repobeats_charts(self, x: int, y: int, width: int, height: int, colors: Dict) -> str:
         """Generate exact RepoBeats-style charts section"""
         chart_width = (width - 40) // 3
         chart_height = height - 60
@@ -622,31 +759,29 @@ class SVGGenerator:
         charts.append(self._generate_repobeats_chart(
             x, y, chart_width, chart_height,
             "Issues", "Opened", "Closed",
-            issue_blue, issue_dark_blue, data
+            issue_blue, issue_dark_blue
         ))
 
         # Pull Requests Chart
         charts.append(self._generate_repobeats_chart(
             x + chart_width + 20, y, chart_width, chart_height,
             "Pull Requests", "Opened", "Closed",
-            pr_purple, pr_dark_purple, data
+            pr_purple, pr_dark_purple
         ))
 
         # Pushes & Commits Chart
         charts.append(self._generate_repobeats_chart(
             x + (chart_width + 20) * 2, y, chart_width, chart_height,
-            "Pushes & Commits", "Pushes", "Commits",
-            commit_orange, commit_red, data
+            "Pushes &amp; Commits", "Pushes", "Commits",
+            commit_orange, commit_red
         ))
 
         return '\n'.join(charts)
 
     def _generate_repobeats_chart(self, x: int, y: int, width: int, height: int,
                                  title: str, label1: str, label2: str,
-                                 color1: str, color2: str, data: Dict) -> str:
+                                 color1: str, color2: str) -> str:
         """Generate individual RepoBeats-style chart"""
-        stats = data["statistics"]
-
         # Chart title with icon (using simple ASCII symbols to avoid XML parsing issues)
         icon = "O" if "Issues" in title else (">" if "Pull" in title else "*")
 
@@ -700,22 +835,8 @@ class SVGGenerator:
 
         return '\n'.join(chart_parts)
 
-    def _generate_repobeats_contributors(self, x: int, y: int, width: int, contributors: List, colors: Dict) -> str:
+    def _generate_repobeats_contributors(self, x: int, y: int, width: int, contributor_names: List[str], colors: Dict) -> str:
         """Generate exact RepoBeats-style contributors section"""
-        # Default contributor names if no data
-        default_contributors = ["tommoor", "hmacr", "HalfVoxel", "outline-trans", "TimeToCodeSom"]
-
-        contributor_names = []
-        if contributors and len(contributors) > 0:
-            contributor_names = [c.get("login", f"user{i}") for i, c in enumerate(contributors[:5])]
-        else:
-            contributor_names = default_contributors
-
-        # Ensure we have exactly 5 contributors
-        while len(contributor_names) < 5:
-            contributor_names.append(f"contributor{len(contributor_names)+1}")
-        contributor_names = contributor_names[:5]
-
         heatmap_parts = [
             f'<text x="{x}" y="{y+15}" font-family="-apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif" font-size="14" font-weight="600" fill="#24292f">+ Top Contributors</text>'
         ]
@@ -766,9 +887,31 @@ class SVGGenerator:
 
         return '\n'.join(heatmap_parts)
 
-    def generate_modern_dark_dashboard(self, data: Dict, theme: str = "dark") -> str:
+    def generate_modern_dark_dashboard(self, data: RepoStats, theme: str = "dark") -> str:
         """Generate modern dark dashboard matching the sleek design"""
-        # Modern dark color scheme
+        return self._render_dashboard("modern", data, theme)
+
+    def _modern_values(self, data: RepoStats, colors: Dict) -> Dict[str, Any]:
+        """Slot values of the modern dark dashboard"""
+        # Stats text
+        push_count = min(data.total_commits // 4, 99)
+        commit_count = min(data.total_commits, 999)
+
+        # Donut chart segments
+        total = push_count + commit_count
+        push_angle = (push_count / total) * 360 if total > 0 else 0
+        commit_angle = (commit_count / total) * 360 if total > 0 else 0
+
+        return {
+            "push_count": push_count,
+            "commit_count": commit_count,
+            "push_dash": push_angle * 2.8,
+            "commit_dash": commit_angle * 2.8
+        }
+
+    def _modern_layout(self, theme_colors: Dict, values: Dict[str, str]) -> str:
+        """Markup of the modern dark dashboard around its formatted slot values"""
+        # Modern dark color scheme (the same for every theme)
         colors = {
             "background": "#1a1a1a",
             "card_bg": "#2d2d2d",
@@ -782,10 +925,6 @@ class SVGGenerator:
             "orange": "#f59e0b"
         }
 
-        # Safe data extraction with defaults
-        repo = data.get("repository", {})
-        stats = data.get("statistics", {})
-
         # SVG dimensions
         width = 500
         height = 300
@@ -801,20 +940,18 @@ class SVGGenerator:
             f'<text x="35" y="45" font-family="Inter, -apple-system, sans-serif" font-size="14" font-weight="500" fill="{colors["text_secondary"]}">Repo name</text>',
 
             # Chart area
-            self._generate_modern_chart_area(35, 60, 280, 160, data, colors),
+            self._generate_modern_chart_area(35, 60, 280, 160, colors),
 
             # Stats circle on the right
-            self._generate_modern_stats_circle(340, 60, 100, 160, data, colors),
+            self._generate_modern_stats_circle(340, 60, 100, 160, values, colors),
 
             '</svg>'
         ]
 
         return '\n'.join(svg_parts)
 
-    def _generate_modern_chart_area(self, x: int, y: int, width: int, height: int, data: Dict, colors: Dict) -> str:
+    def _generate_modern_chart_area(self, x: int, y: int, width: int, height: int, colors: Dict) -> str:
         """Generate modern line chart area"""
-        stats = data["statistics"]
-
         # Generate sample data points for the chart
         points_green = []
         points_purple = []
@@ -848,47 +985,19 @@ class SVGGenerator:
 
         return '\n'.join(chart_parts)
 
-    def _generate_modern_stats_circle(self, x: int, y: int, width: int, height: int, data: Dict, colors: Dict) -> str:
+    def _generate_modern_stats_circle(self, x: int, y: int, width: int, height: int,
+                                      values: Dict[str, str], colors: Dict) -> str:
         """Generate modern circular stats display"""
-        stats = data["statistics"]
-
-        # Stats text
-        push_count = min(stats.get("total_commits", 24) // 4, 99)
-        commit_count = min(stats.get("total_commits", 64), 999)
+        push_count = values["push_count"]
+        commit_count = values["commit_count"]
+        push_dash = values["push_dash"]
+        commit_dash = values["commit_dash"]
 
         # Circle center
         center_x = x + width // 2
         center_y = y + height // 2
         radius = 35
 
-        # Create donut chart segments
-        total = push_count + commit_count
-        if total > 0:
-            # Calculate angles
-            push_angle = (push_count / total) * 360
-            commit_angle = (commit_count / total) * 360
-
-            # Convert to radians for path calculation
-            import math
-            push_rad = math.radians(push_angle)
-            commit_rad = math.radians(commit_angle)
-
-            # Create arc paths
-            push_end_x = center_x + radius * math.cos(push_rad - math.pi/2)
-            push_end_y = center_y + radius * math.sin(push_rad - math.pi/2)
-
-            commit_start_x = push_end_x
-            commit_start_y = push_end_y
-            commit_end_x = center_x + radius * math.cos(-math.pi/2)
-            commit_end_y = center_y + radius * math.sin(-math.pi/2)
-        else:
-            push_end_x = center_x
-            push_end_y = center_y - radius
-            commit_start_x = center_x
-            commit_start_y = center_y - radius
-            commit_end_x = center_x
-            commit_end_y = center_y - radius
-
         circle_parts = [
             # Stats labels
             f'<text x="{x}" y="{y-10}" font-family="Inter, -apple-system, sans-serif" font-size="12" font-weight="500" fill="{colors["text_secondary"]}">Push : count</text>',
@@ -898,10 +1007,10 @@ class SVGGenerator:
             f'<circle cx="{center_x}" cy="{center_y}" r="{radius}" fill="none" stroke="{colors["border"]}" stroke-width="8"/>',
 
             # Push segment (orange/red)
-            f'<circle cx="{center_x}" cy="{center_y}" r="{radius}" fill="none" stroke="{colors["orange"]}" stroke-width="8" stroke-dasharray="{push_angle * 2.8} 628" stroke-dashoffset="0" transform="rotate(-90 {center_x} {center_y})"/>',
+            f'<circle cx="{center_x}" cy="{center_y}" r="{radius}" fill="none" stroke="{colors["orange"]}" stroke-width="8" stroke-dasharray="{push_dash} 628" stroke-dashoffset="0" transform="rotate(-90 {center_x} {center_y})"/>',
 
             # Commit segment (green)
-            f'<circle cx="{center_x}" cy="{center_y}" r="{radius}" fill="none" stroke="{colors["green"]}" stroke-width="8" stroke-dasharray="{commit_angle * 2.8} 628" stroke-dashoffset="-{push_angle * 2.8}" transform="rotate(-90 {center_x} {center_y})"/>',
+            f'<circle cx="{center_x}" cy="{center_y}" r="{radius}" fill="none" stroke="{colors["green"]}" stroke-width="8" stroke-dasharray="{commit_dash} 628" stroke-dashoffset="-{push_dash}" transform="rotate(-90 {center_x} {center_y})"/>',
 
             # Inner circle with gradient
             f'<circle cx="{center_x}" cy="{center_y}" r="{radius-15}" fill="url(#modernGradient)"/>',
@@ -923,8 +1032,21 @@ class SVGGenerator:
 
     def generate_animated_text(self, text: str = "Hello World", font_size: int = 24,
                              color: str = "#ffffff", bg_color: str = "#000000",
-                             speed: float = 0.5, theme: str = "default") -> str:
+                             speed: float = 0.5, theme: str = "default", mode: str = "chars") -> str:
         """Generate animated text SVG with typing and untyping effect"""
+        return "".join(self.iter_animated_text(text, font_size, color, bg_color, speed, theme, mode))
+
+    def iter_animated_text(self, text: str = "Hello World", font_size: int = 24,
+                           color: str = "#ffffff", bg_color: str = "#000000",
+                           speed: float = 0.5, theme: str = "default", mode: str = "chars") -> Iterator[str]:
+        """Yield the animated text SVG chunk by chunk
+
+        mode "chars" types one <text> element per character, each with its
+        own <animate>; "reveal" draws the text once and uncovers it with an
+        animated clip, so the markup stays the same size for any length.
+        """
+        if mode not in ANIMATED_TEXT_MODES:
+            raise Exception(f"Unknown animated text mode: {mode}")
 
         # Handle empty text
         if not text or text.strip() == "":
@@ -957,70 +1079,57 @@ class SVGGenerator:
         pause_time = 1.0  # pause at full text
         total_untype_time = len(text) * char_duration * 0.7  # untype faster
         total_animation_time = total_type_time + pause_time + total_untype_time
+        pause_end = ((total_type_time + pause_time) / total_animation_time) * 100
 
-        # Generate keyframes for typing effect
-        typing_keyframes = []
-        untyping_keyframes = []
+        yield f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">'
+        yield f'\n<rect width="{width}" height="{height}" fill="{bg_color}"/>'
 
-        # Typing animation keyframes
-        for i in range(len(text) + 1):
-            time_percent = (i * char_duration / total_animation_time) * 100
-            visible_text = text[:i]
-            typing_keyframes.append(f'{time_percent:.1f}% {{ opacity: 1; }} ')
+        # Add subtle background pattern for some themes
+        yield '\n' + self._generate_background_pattern(width, height, theme)
 
-        # Pause keyframe
-        pause_start = (total_type_time / total_animation_time) * 100
-        pause_end = ((total_type_time + pause_time) / total_animation_time) * 100
+        char_y = padding + font_size * 0.7
+        cursor_x = padding + len(text) * char_width + 5
+        if mode == "reveal":
+            yield self._generate_text_reveal(text, padding, char_y, text_width, height, font_size, color,
+                                             total_type_time / total_animation_time, pause_end / 100,
+                                             total_animation_time)
+            # The cursor follows the edge of the reveal
+            cursor_motion = (
+                f'\n                <animate attributeName="x"\n'
+                f'                         values="{padding + 5:g};{cursor_x:g};{cursor_x:g};{padding + 5:g}"\n'
+                f'                         dur="{total_animation_time:g}s"\n'
+                f'                         keyTimes="0;{total_type_time / total_animation_time:.3f};{pause_end / 100:.3f};1"\n'
+                f'                         repeatCount="indefinite"/>'
+            )
+        else:
+            # Animated characters
+            for i, char in enumerate(text):
+                # When this character appears (typing)
+                appear_time = (i * char_duration / total_animation_time) * 100
+                # When this character disappears (untyping)
+                disappear_time = pause_end + ((len(text) - i - 1) * char_duration * 0.7 / total_animation_time) * 100
+
+                char_x = padding + i * char_width
 
-        # Untyping animation keyframes
-        untype_start = pause_end
-        for i in range(len(text), -1, -1):
-            progress = (len(text) - i) / len(text)
-            time_percent = untype_start + (progress * (total_untype_time / total_animation_time) * 100)
-            untyping_keyframes.append(f'{time_percent:.1f}% {{ opacity: 1; }} ')
-
-        # Create individual character animations
-        char_animations = []
-        for i, char in enumerate(text):
-            # When this character appears (typing)
-            appear_time = (i * char_duration / total_animation_time) * 100
-            # When this character disappears (untyping)
-            disappear_time = pause_end + ((len(text) - i - 1) * char_duration * 0.7 / total_animation_time) * 100
-
-            char_x = padding + i * char_width
-            char_y = padding + font_size * 0.7
-
-            char_animations.append(f'''
+                yield f'''\n
                 <text x="{char_x}" y="{char_y}"
                       font-family="'Courier New', monospace"
                       font-size="{font_size}"
                       font-weight="bold"
                       fill="{color}"
                       opacity="0">
-                    {char}
+                    {escape(char)}
                     <animate attributeName="opacity"
                              values="0;1;1;0;0"
                              dur="{total_animation_time}s"
                              keyTimes="0;{appear_time/100:.3f};{pause_end/100:.3f};{disappear_time/100:.3f};1"
                              repeatCount="indefinite"/>
-                </text>''')
+                </text>'''
+            cursor_motion = ""
 
-        # Cursor animation
-        cursor_x = padding + len(text) * char_width + 5
+        # Blinking cursor
         cursor_y = char_y
-
-        svg_parts = [
-            f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">',
-            f'<rect width="{width}" height="{height}" fill="{bg_color}"/>',
-
-            # Add subtle background pattern for some themes
-            self._generate_background_pattern(width, height, theme),
-
-            # Animated characters
-            *char_animations,
-
-            # Blinking cursor
-            f'''<text x="{cursor_x}" y="{cursor_y}"
+        yield f'''\n<text x="{cursor_x}" y="{cursor_y}"
                       font-family="'Courier New', monospace"
                       font-size="{font_size}"
                       font-weight="bold"
@@ -1029,16 +1138,72 @@ class SVGGenerator:
                 <animate attributeName="opacity"
                          values="1;0;1"
                          dur="1s"
-                         repeatCount="indefinite"/>
-            </text>''',
+                         repeatCount="indefinite"/>{cursor_motion}
+            </text>'''
 
-            # Title/watermark
-            f'<text x="{width-10}" y="{height-10}" font-family="Arial, sans-serif" font-size="8" fill="{color}" opacity="0.3" text-anchor="end">Animated by RepoStats API</text>',
+        # Title/watermark
+        yield f'\n<text x="{width-10}" y="{height-10}" font-family="Arial, sans-serif" font-size="8" fill="{color}" opacity="0.3" text-anchor="end">Animated by RepoStats API</text>'
 
-            '</svg>'
-        ]
+        yield '\n</svg>'
 
-        return '\n'.join(svg_parts)
+    def _generate_text_reveal(self, text: str, x: float, y: float, text_width: float, height: int,
+                              font_size: int, color: str, typed_at: float, untype_at: float,
+                              duration: float) -> str:
+        """Draw the whole text once, uncovered and covered again by an animated clip width"""
+        return f'''
+                <defs>
+                    <clipPath id="reveal">
+                        <rect x="{x}" y="0" width="0" height="{height}">
+                            <animate attributeName="width"
+                                     values="0;{text_width:g};{text_width:g};0"
+                                     dur="{duration:g}s"
+                                     keyTimes="0;{typed_at:.3f};{untype_at:.3f};1"
+                                     repeatCount="indefinite"/>
+                        </rect>
+                    </clipPath>
+                </defs>
+                <text x="{x}" y="{y}"
+                      font-family="'Courier New', monospace"
+                      font-size="{font_size}"
+                      font-weight="bold"
+                      fill="{color}"
+                      textLength="{text_width:g}"
+                      lengthAdjust="spacingAndGlyphs"
+                      xml:space="preserve"
+                      clip-path="url(#reveal)">{escape(text)}</text>'''
+
+    def generate_sprite_svg(self, badges: List[Tuple[str, str]]) -> str:
+        """Stack (view id, SVG) badges into one sprite SVG
+
+        Each badge becomes a nested <svg> with a matching <view>, so
+        `sprite.svg#<view id>` shows just that badge; view ids must be
+        unique. Ids and class names inside a badge are prefixed with its
+        position to keep gradients, clips and compact styles apart.
+        """
+        views = []
+        parts = []
+        y = 0.0
+        sprite_width = 0.0
+        for index, (view_id, svg) in enumerate(badges):
+            root = SVG_ROOT_PATTERN.search(svg)
+            if root is None:
+                continue
+            size = dict(SVG_SIZE_PATTERN.findall(root.group()))
+            width = float(size.get("width", 0))
+            height = float(size.get("height", 0))
+
+            badge = SVG_ID_PATTERN.sub(lambda match: f"{match.group(1)}b{index}-{match.group(2)}", svg[root.start():])
+            badge = _prefix_classes(badge, f"b{index}-")
+            parts.append(badge.replace("<svg", f'<svg x="0" y="{y:g}"', 1))
+            views.append(f'<view id="{view_id}" viewBox="0 {y:g} {width:g} {height:g}"/>')
+            y += height
+            sprite_width = max(sprite_width, width)
+
+        return (
+            f'<svg width="{sprite_width:g}" height="{y:g}" xmlns="http://www.w3.org/2000/svg">\n'
+            + "\n".join(views + parts)
+            + "\n</svg>"
+        )
 
     def _generate_background_pattern(self, width: int, height: int, theme: str) -> str:
         """Generate background pattern based on theme"""
@@ -1064,3 +1229,12 @@ class SVGGenerator:
             '''
         else:
             return ""
+
+_shared_generator = None
+
+def shared_generator() -> SVGGenerator:
+    """The generator instance of this process"""
+    global _shared_generator
+    if _shared_generator is None:
+        _shared_generator = SVGGenerator()
+    return _shared_generator
@@ -0,0 +1,49 @@
+import re
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Slot markers cannot occur in rendered SVG text (XML forbids NUL)
+SLOT_PATTERN = re.compile("\x00([A-Za-z0-9_]+)\x00")
+
+def slot(name: str) -> str:
+    """Placeholder for a dynamic value in markup being compiled into a template"""
+    return f"\x00{name}\x00"
+
+class SVGTemplate:
+    """An SVG compiled into static chunks and typed dynamic slots
+
+    The markup is rendered once with `slot()` placeholders and split around
+    them. Rendering copies the pre-sized list of chunks, drops each slot's
+    formatted value into its position and joins the result, so none of the
+    static markup is rebuilt.
+    """
+
+    def __init__(self, source: str, slots: Dict[str, Callable[[Any], str]]):
+        # re.split with a group alternates static chunks and slot names
+        self.parts: List[str] = SLOT_PATTERN.split(source)
+        self.positions: List[Tuple[int, str, Callable[[Any], str]]] = []
+        for index in range(1, len(self.parts), 2):
+            name = self.parts[index]
+            if name not in slots:
+                raise Exception(f"Template slot {name} has no type")
+            self.positions.append((index, name, slots[name]))
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Fill every slot with its formatted value"""
+        parts = self.parts.copy()
+        for index, name, format_value in self.positions:
+            parts[index] = format_value(values[name])
+        return "".join(parts)
+
+    def iter_render(self, values: Dict[str, Any]) -> Iterator[str]:
+        """Yield the rendered SVG chunk by chunk, formatting each slot as it is reached"""
+        slots = iter(self.positions)
+        for index, part in enumerate(self.parts):
+            if index % 2:
+                _, name, format_value = next(slots)
+                yield format_value(values[name])
+            elif part:
+                yield part
+
+    def static_size(self) -> int:
+        """Length of the static markup shared by every render"""
+        return sum(len(part) for part in self.parts[::2])
@@ -0,0 +1,95 @@
+import time
+from typing import Any, Dict, List, Optional
+
+class TokenPool:
+    """Pool of GitHub tokens with per-token rate limit tracking
+
+    Budgets are learned from the X-RateLimit-* headers of every response,
+    separately per resource (core, graphql, search). Requests go to the
+    token with the most remaining budget; exhausted tokens are skipped
+    until their reset time.
+    """
+
+    def __init__(self, tokens: List[Optional[str]]):
+        # A pool without tokens makes unauthenticated requests (60/hour)
+        self.tokens: List[Optional[str]] = list(tokens) or [None]
+        self.limits: Dict[Optional[str], Dict[str, Dict[str, float]]] = {
+            token: {} for token in self.tokens
+        }
+
+    @property
+    def authenticated(self) -> bool:
+        return any(self.tokens)
+
+    def acquire(self, resource: str = "core") -> Optional[str]:
+        """Pick the token with the most remaining budget for a resource
+
+        Raises if every token is exhausted until its reset time.
+        """
+        now = time.time()
+        best_token = None
+        best_remaining = -1.0
+        for token in self.tokens:
+            state = self.limits[token].get(resource)
+            if state is None:
+                remaining = float("inf")  # Unknown budget: assume it is fresh
+            elif state["reset"] <= now:
+                remaining = state["limit"]
+            else:
+                remaining = state["remaining"]
+            if remaining > best_remaining:
+                best_token, best_remaining = token, remaining
+
+        if best_remaining <= 0:
+            reset_in = int(self.reset_at(resource) - now)
+            raise Exception(f"API rate limit exceeded for all tokens, resets in {max(reset_in, 0)}s")
+        return best_token
+
+    def update(self, token: Optional[str], headers: Any):
+        """Record the budget reported by a response's X-RateLimit-* headers"""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        try:
+            resource = headers.get("X-RateLimit-Resource", "core")
+            self.limits[token][resource] = {
+                "limit": float(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": float(headers["X-RateLimit-Remaining"]),
+                "reset": float(headers.get("X-RateLimit-Reset", 0))
+            }
+        except (KeyError, ValueError):
+            pass
+
+    def mark_exhausted(self, token: Optional[str], resource: str = "core", reset: Optional[float] = None):
+        """Take a token out of rotation after a rate limit error"""
+        state = self.limits[token].setdefault(resource, {"limit": 0.0, "remaining": 0.0, "reset": 0.0})
+        state["remaining"] = 0.0
+        state["reset"] = reset if reset else max(state["reset"], time.time() + 60)
+
+    def budget_fraction(self, resource: str = "core") -> float:
+        """Fraction of the pool's budget left for a resource (1.0 if unknown)"""
+        now = time.time()
+        total_limit = 0.0
+        total_remaining = 0.0
+        for token in self.tokens:
+            state = self.limits[token].get(resource)
+            if state is None:
+                return 1.0  # A token that has not been used yet still has its full budget
+            total_limit += state["limit"]
+            total_remaining += state["limit"] if state["reset"] <= now else state["remaining"]
+        return total_remaining / total_limit if total_limit else 1.0
+
+    def reset_at(self, resource: str = "core") -> float:
+        """Earliest time any token's budget for a resource resets"""
+        resets = [
+            self.limits[token][resource]["reset"]
+            for token in self.tokens if resource in self.limits[token]
+        ]
+        return min(resets) if resets else time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-resource budget metrics"""
+        resources = {resource for token in self.tokens for resource in self.limits[token]}
+        return {
+            "tokens": len([token for token in self.tokens if token]),
+            "budget": {resource: round(self.budget_fraction(resource), 3) for resource in sorted(resources)}
+        }
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for CacheManager: single-flight fills, stale-while-revalidate and
+batched writes, run against the memory cache alone and (with fakeredis
+installed) against Redis
+"""
+
+import asyncio
+
+from src.cache_manager import CacheManager
+
+try:
+    import fakeredis
+    import fakeredis.aioredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+def cache_managers():
+    """(backend, CacheManager) for the memory-only fallback and, if available, a fake Redis"""
+    memory = CacheManager()
+    memory.redis_client = None
+    managers = [("memory", memory)]
+    if FAKEREDIS_AVAILABLE:
+        backed = CacheManager()
+        backed.redis_client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer())
+        managers.append(("redis", backed))
+    return managers
+
+def run_on_each_backend(check):
+    """Run an async check against a fresh CacheManager per backend"""
+    async def run():
+        for backend, cache in cache_managers():
+            try:
+                await check(cache)
+            except AssertionError as e:
+                raise AssertionError(f"{backend}: {e}") from e
+            finally:
+                await cache.close()
+    asyncio.run(run())
+
+async def wait_for_refresh(cache, key):
+    """Let a background refresh of key finish, whether it succeeds or not"""
+    future = cache.inflight.get(key)
+    if future is not None:
+        await asyncio.gather(future, return_exceptions=True)
+
+def test_concurrent_misses_share_one_producer_call():
+    async def check(cache):
+        calls = 0
+
+        async def produce():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "value"
+
+        values = await asyncio.gather(*(cache.get_or_set("key", produce, expire=60) for _ in range(20)))
+        assert values == ["value"] * 20
+        assert calls == 1, calls
+        assert not cache.inflight
+
+    run_on_each_backend(check)
+
+def test_stale_hit_is_served_at_once_and_refreshed_in_the_background():
+    async def check(cache):
+        versions = iter(["v1", "v2"])
+        refresh_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def produce():
+            value = next(versions)
+            if value == "v2":
+                refresh_started.set()
+                await release.wait()
+            return value
+
+        # expire=0 makes the entry stale as soon as it is written
+        assert await cache.get_or_set("key", produce, expire=0) == "v1"
+
+        # The stale value comes back without waiting for the refresh
+        assert await asyncio.wait_for(cache.get_or_set("key", produce, expire=0), 1) == "v1"
+        await asyncio.wait_for(refresh_started.wait(), 1)
+        assert "key" in cache.inflight
+
+        release.set()
+        await wait_for_refresh(cache, "key")
+        entry = await cache.get_entry("key")
+        assert entry["value"] in ("v2", b"v2"), entry
+
+    run_on_each_backend(check)
+
+def test_failed_refresh_keeps_the_stale_entry():
+    async def check(cache):
+        calls = 0
+
+        async def produce():
+            nonlocal calls
+            calls += 1
+            if calls > 1:
+                raise Exception("GitHub is down")
+            return "v1"
+
+        assert await cache.get_or_set("key", produce, expire=0) == "v1"
+        assert await cache.get_or_set("key", produce, expire=0) == "v1"
+        await wait_for_refresh(cache, "key")
+        assert calls == 2
+
+        # Still served, and the next request tries again
+        assert await cache.get_or_set("key", produce, expire=0) == "v1"
+        await wait_for_refresh(cache, "key")
+        assert calls == 3
+
+    run_on_each_backend(check)
+
+def test_set_many_stores_a_ttl_per_key():
+    async def check(cache):
+        await cache.set_many({"short": "a", "long": "b", "default": "c"}, expire={"short": 10, "long": 1000})
+        assert await cache.get_many(["short", "long", "default"]) == {"short": "a", "long": "b", "default": "c"}
+
+        if cache.redis_client:
+            ttls = {key: await cache.redis_client.ttl(key) for key in ("short", "long", "default")}
+            assert 0 < ttls["short"] <= 10 and 900 < ttls["long"] <= 1000 and 3500 < ttls["default"] <= 3600, ttls
+        else:
+            expiries = {key: entry[1] for key, entry in cache.memory_cache.entries.items()}
+            assert expiries["short"] < expiries["long"] < expiries["default"], expiries
+
+    run_on_each_backend(check)
+
+if __name__ == "__main__":
+    test_concurrent_misses_share_one_producer_call()
+    test_stale_hit_is_served_at_once_and_refreshed_in_the_background()
+    test_failed_refresh_keeps_the_stale_entry()
+    test_set_many_stores_a_ttl_per_key()
+    print("✅ Cache manager tests passed")
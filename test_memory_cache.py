@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for MemoryCache: LRU eviction within its byte budget and
+per-entry expiration
+"""
+
+import time
+
+from src.memory_cache import MemoryCache, _sizeof
+
+def entry_size(key, value):
+    return _sizeof(key) + _sizeof(value)
+
+def test_least_recently_used_entries_are_evicted_by_bytes():
+    value = "x" * 100
+    cache = MemoryCache(max_bytes=3 * entry_size("key0", value))
+    for index in range(3):
+        cache.set(f"key{index}", value)
+
+    # Reading key0 makes key1 the least recently used
+    assert cache.get("key0") == value
+    cache.set("key3", value)
+
+    assert cache.get("key1") is None
+    assert all(cache.get(key) == value for key in ("key0", "key2", "key3"))
+    assert cache.evictions == 1
+    assert cache.current_bytes <= cache.max_bytes
+
+def test_oversized_value_is_rejected_without_flushing_the_cache():
+    cache = MemoryCache(max_bytes=1000)
+    cache.set("small", "x")
+    assert not cache.set("big", "x" * 2000)
+    assert cache.get("small") == "x"
+    assert cache.get("big") is None
+    assert cache.rejections == 1
+
+def test_expired_entries_are_dropped():
+    cache = MemoryCache()
+    cache.set("short", "a", expire=0.05)
+    cache.set("long", "b", expire=60)
+    time.sleep(0.1)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == "b"
+    assert len(cache) == 1
+    assert cache.current_bytes == entry_size("long", "b")
+
+def test_set_many_applies_a_ttl_per_key():
+    cache = MemoryCache()
+    assert cache.set_many({"short": "a", "long": "b"}, expire={"short": 0.05, "long": 60}) == 2
+    time.sleep(0.1)
+
+    # Purging runs on the next write
+    cache.set("other", "c")
+    assert "short" not in cache.entries
+    assert cache.get_many(["short", "long"]) == {"short": None, "long": "b"}
+    assert cache.expirations == 1
+
+if __name__ == "__main__":
+    test_least_recently_used_entries_are_evicted_by_bytes()
+    test_oversized_value_is_rejected_without_flushing_the_cache()
+    test_expired_entries_are_dropped()
+    test_set_many_applies_a_ttl_per_key()
+    print("✅ Memory cache tests passed")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for compact SVG output: every endpoint's SVG must stay well-formed
+and keep its text content
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+from src.compression import compress_variants
+from src.repo_stats import RepoStats
+from src.svg_compact import BARE_AMPERSAND, XML_SPACE, compact_svg
+from src.svg_generator import SVGGenerator
+
+REPO_DATA = RepoStats.from_github(
+    "repo",
+    {"name": "repo", "description": "A sample & repository", "stargazers_count": 12345, "forks_count": 678},
+    [{"login": f"user{i}", "contributions": 100 - i} for i in range(5)],
+    [{"week": i, "total": (i * 7) % 23} for i in range(52)],
+    {"Python": 7000, "C": 2000, "Go": 550, "Rust": 300, "Shell": 150},
+    {"open_issues": 40, "closed_issues": 60, "total_issues": 100}
+)
+
+CONTRIBUTOR_DATA = {
+    "username": "user0", "repository": "owner/repo", "total_commits": 420,
+    "activity": {f"2024-{month:02d}-{day:02d}": (month * day) % 7 for month in range(1, 13) for day in range(1, 29)}
+}
+
+def endpoint_svgs():
+    """(name, SVG) for the output of every SVG endpoint"""
+    generator = SVGGenerator()
+    svgs = [
+        ("embed", generator.generate_repo_stats_svg(REPO_DATA, "default")),
+        ("contributor", generator.generate_contributor_stats_svg(CONTRIBUTOR_DATA, "default")),
+        ("activity", generator.generate_commit_activity_svg(REPO_DATA, "default")),
+        ("repobeats", generator.generate_repobeats_style_svg(REPO_DATA, "dark")),
+        ("modern", generator.generate_modern_dark_dashboard(REPO_DATA, "dark"))
+    ]
+    for theme in ("dark", "light", "matrix", "neon"):
+        for mode in ("chars", "reveal"):
+            svgs.append((f"text {theme} {mode}",
+                         generator.generate_animated_text("Hello  World & friends", theme=theme, mode=mode)))
+    return svgs
+
+def text_content(root: ET.Element):
+    """Rendered text of every <text> element (whitespace collapsed unless preserved)"""
+    texts = []
+    for element in root.iter("{http://www.w3.org/2000/svg}text"):
+        text = "".join(element.itertext())
+        texts.append(text if element.get(XML_SPACE) == "preserve" else " ".join(text.split()))
+    return texts
+
+def test_compact_output_is_well_formed_with_the_same_text():
+    for name, svg in endpoint_svgs():
+        original = ET.fromstring(BARE_AMPERSAND.sub("&amp;", svg))
+        compact = compact_svg(svg)
+        try:
+            root = ET.fromstring(compact)
+        except ET.ParseError as e:
+            raise AssertionError(f"{name}: compact SVG is not well-formed: {e}")
+        assert text_content(root) == text_content(original), name
+
+def test_compact_keeps_spaces_next_to_child_elements():
+    svg = '<svg xmlns="http://www.w3.org/2000/svg"><text>\n  Total   Commits: <tspan>420</tspan>\n</text></svg>'
+    assert compact_svg(svg) == '<svg xmlns="http://www.w3.org/2000/svg"><text>Total Commits: <tspan>420</tspan></text></svg>'
+
+def test_compact_writes_namespaced_attributes_with_their_prefix():
+    svg = '<svg xmlns="http://www.w3.org/2000/svg"><text xml:space="preserve">a   b</text></svg>'
+    assert compact_svg(svg) == svg
+
+def test_compact_sprite_keeps_each_badge_styles_apart():
+    generator = SVGGenerator()
+    sprite = generator.generate_sprite_svg([
+        (f"embed-{theme}", compact_svg(generator.generate_repo_stats_svg(REPO_DATA, theme)))
+        for theme in ("default", "dark")
+    ])
+    root = ET.fromstring(BARE_AMPERSAND.sub("&amp;", sprite))
+    namespace = "{http://www.w3.org/2000/svg}"
+
+    defined = []
+    for index, badge in enumerate(root.findall(f"{namespace}svg")):
+        styles = "".join(style.text or "" for style in badge.iter(f"{namespace}style"))
+        rules = re.findall(r"\.([\w-]+)\{", styles)
+        used = {name for element in badge.iter() for name in element.get("class", "").split()}
+        assert rules and used <= set(rules), index
+        defined.extend(rules)
+    # A class defined by two badges would restyle both of them
+    assert len(defined) == len(set(defined))
+
+def test_compact_styles_are_smaller_once_compressed():
+    from main import COMPACT_STYLES
+
+    generator = SVGGenerator()
+    svgs = {
+        "repo_stats": generator.generate_repo_stats_svg(REPO_DATA, "default"),
+        "contributor_stats": generator.generate_contributor_stats_svg(CONTRIBUTOR_DATA, "default"),
+        "commit_activity": generator.generate_commit_activity_svg(REPO_DATA, "default"),
+        "repobeats_style": generator.generate_repobeats_style_svg(REPO_DATA, "dark"),
+        "modern_dashboard": generator.generate_modern_dark_dashboard(REPO_DATA, "dark"),
+        "text_animation": generator.generate_animated_text("Hello World")
+    }
+    assert set(COMPACT_STYLES) <= set(svgs)
+    for style in COMPACT_STYLES:
+        normal = compress_variants(svgs[style].encode("utf-8"))
+        compact = compress_variants(compact_svg(svgs[style]).encode("utf-8"))
+        for encoding in normal:
+            assert len(compact[encoding]) < len(normal[encoding]), (style, encoding)
+
+if __name__ == "__main__":
+    test_compact_output_is_well_formed_with_the_same_text()
+    test_compact_keeps_spaces_next_to_child_elements()
+    test_compact_writes_namespaced_attributes_with_their_prefix()
+    test_compact_sprite_keeps_each_badge_styles_apart()
+    test_compact_styles_are_smaller_once_compressed()
+    print("✅ Compact SVG tests passed")